@@ -0,0 +1,291 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from classical.engine import run_batched_ga
+from classical.fused import generation_kernel
+from classical.landscapes import get_landscape, rastrigin
+from classical.operators import blend_crossover, gaussian_mutate
+from classical.rastrigin_nd import run_ga_rastrigin_nd
+from classical.selection import top_k, tournament_winners
+from quantum.exploration import ExplorationOperator, explore_nd
+from quantum.hybrid_ga import run_hybrid_ga
+from quantum.hybridTest import X_MAX, X_MIN, quantum_explore
+from quantum.measurement import basin_probabilities
+from quantum.statevector import dft, uniform_states
+
+# ============================================================
+# BENCHMARK SUITE
+# ------------------------------------------------------------
+# Times the hot GA and quantum kernels over a ladder of population,
+# dimension and grid sizes, plus whole GA runs for generations/sec.
+# Each case reports seconds per call (best of `repeat` timing rounds),
+# items/sec (evaluations, individuals, shots or amplitudes per second),
+# generations/sec for full runs, and peak traced memory of one call.
+#
+# Every invocation appends a record to results/benchmarks/history.json
+# and is compared case by case with results/benchmarks/baseline.json;
+# a case slower than baseline by more than --tolerance is flagged.
+#
+# From the code/ directory:
+#   python benchmarks.py                   # full ladder, compare to baseline
+#   python benchmarks.py --quick -k tourn  # small sizes, matching cases only
+#   python benchmarks.py --save-baseline   # make this run the new baseline
+# ============================================================
+
+BENCH_DIR = os.path.join("results", "benchmarks")
+HISTORY_FN = os.path.join(BENCH_DIR, "history.json")
+BASELINE_FN = os.path.join(BENCH_DIR, "baseline.json")
+
+SIZES = {
+    "pop": [1_000, 10_000, 100_000, 1_000_000],
+    "dim": [2, 8, 32],
+    "grid": [128, 1_024, 8_192, 65_536],
+    "shots": [1_000, 100_000],
+    "trials": [30, 300],
+}
+QUICK_SIZES = {
+    "pop": [1_000, 10_000],
+    "dim": [2, 8],
+    "grid": [128, 1_024],
+    "shots": [1_000],
+    "trials": [30],
+}
+
+
+# ===================== CASES =====================
+# A case is (name, size label, setup) where setup() returns
+# (fn, items, gens): fn() is timed, items counts the work of one call
+# (for items/sec) and gens the generations one call runs (0: a kernel).
+
+def kernel_cases(sizes):
+    rng = np.random.default_rng(0)
+    cases = []
+    deceptive = get_landscape("deceptive")
+
+    for n in sizes["pop"]:
+        scores = rng.random(n)
+        pop = rng.uniform(-5.12, 5.12, n)
+        cases += [
+            ("tournament", f"pop={n}",
+             lambda s=scores: (lambda: tournament_winners(s, 5, rng=rng), len(s), 0)),
+            ("elitism", f"pop={n}",
+             lambda s=scores: (lambda: top_k(s, 2), len(s), 0)),
+            ("truncation", f"pop={n}",
+             lambda s=scores: (lambda: top_k(s, len(s) - 2, order="position"), len(s), 0)),
+            ("blend_crossover", f"pop={n}",
+             lambda p=pop: (lambda: blend_crossover(p, 0.8, rng), len(p), 0)),
+            ("mutate", f"pop={n}",
+             lambda p=pop: (lambda: gaussian_mutate(p.copy(), 0.2, 0.3, (-5.12, 5.12), rng),
+                            len(p), 0)),
+            ("rastrigin_2d", f"pop={n}",
+             lambda n=n: (lambda X=rng.uniform(-5.12, 5.12, (n, 2)): rastrigin(X), n, 0)),
+            ("quantum_explore", f"pop={n}",
+             lambda n=n: (lambda p=rng.uniform(X_MIN, X_MAX, n): quantum_explore(p, rng), n, 0)),
+        ]
+    for d in sizes["dim"]:
+        n = sizes["pop"][1]
+        cases.append(("rastrigin_nd", f"pop={n},dim={d}",
+                      lambda n=n, d=d: (lambda X=rng.uniform(-5.12, 5.12, (n, d)): rastrigin(X),
+                                        n, 0)))
+    for m in sizes["grid"]:
+        B = 64
+        states = uniform_states(m, B) * np.exp(1j * rng.random((B, m)))
+        masks = np.stack([np.arange(m) < m // 2, np.arange(m) >= m // 2])
+        pop = rng.normal(2.0, 0.5, sizes["pop"][1])
+        cases += [
+            ("mix_state/apply_dft", f"batch={B},grid={m}",
+             lambda s=states: (lambda: dft(s), s.size, 0)),
+            ("measure_state", f"batch={B},grid={m}",
+             lambda s=states, k=masks: (lambda: basin_probabilities(s, k), s.size, 0)),
+            ("quantum_explore_grid", f"pop={len(pop)},grid={m}",
+             lambda p=pop, m=m: (lambda: ExplorationOperator(p, X_MIN, X_MAX, m).explore(len(p), rng),
+                                 len(p), 0)),
+        ]
+        for shots in sizes["shots"]:
+            cases.append(("measure_state_shots", f"batch={B},grid={m},shots={shots}",
+                          lambda s=states, k=masks, n=shots:
+                          (lambda: basin_probabilities(s, k, n, rng), n * len(s), 0)))
+    for d in sizes["dim"][:2]:
+        n = 200
+        cases.append(("explore_nd", f"pop={n},dim={d},grid=64",
+                      lambda n=n, d=d: (lambda p=rng.normal(0, 1, (n, d)):
+                                        explore_nd(p, n, -5.12, 5.12, 64, rng), n, 0)))
+    # sparse path with a few thousand occupied cells
+    n = 3_000
+    cases.append(("explore_nd", f"pop={n},dim=4,grid=64",
+                  lambda n=n: (lambda p=rng.uniform(-5.12, 5.12, (n, 4)):
+                               explore_nd(p, n, -5.12, 5.12, 64, rng), n, 0)))
+
+    # whole runs: generations/sec and evaluations/sec
+    for trials in sizes["trials"]:
+        gens = 80
+        cases.append(("run_batched_ga", f"trials={trials},pop=30",
+                      lambda t=trials, g=gens: (
+                          lambda: run_batched_ga(deceptive, deceptive.domain, t, gens=g, seed=0),
+                          t * 30 * (g + 1), g)))
+        if generation_kernel(deceptive) is not None:  # numba installed (compiles here)
+            cases.append(("run_batched_ga_numba", f"trials={trials},pop=30",
+                          lambda t=trials, g=gens: (
+                              lambda: run_batched_ga(deceptive, deceptive.domain, t, gens=g,
+                                                     seed=0, backend="numba"),
+                              t * 30 * (g + 1), g)))
+    for d in sizes["dim"]:
+        gens = 150
+        cases.append(("run_ga_rastrigin_nd", f"pop=40,dim={d}",
+                      lambda d=d, g=gens: (
+                          lambda: run_ga_rastrigin_nd(dim=d, gens=g, seed=0),
+                          40 + 38 * g, g)))
+    cases.append(("run_hybrid_ga", "trials=30,pop=200",
+                  lambda: (lambda: run_hybrid_ga(30, gens=50, seed=0), None, 50)))
+    return cases
+
+
+# ===================== TIMING =====================
+def time_case(fn, repeat=3, min_time=0.2):
+    """Best seconds per call over `repeat` rounds of at least min_time each."""
+    fn()  # warm-up (caches, first-touch allocation)
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed))
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / loops)
+    return best
+
+
+def peak_memory(fn):
+    """Peak bytes allocated (numpy buffers included) during one call."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_cases(cases, repeat=3, min_time=0.2, log=print):
+    results = {}
+    for name, label, setup in cases:
+        fn, items, gens = setup()
+        if items is None:
+            # runs that report their own evaluation count
+            items = int(np.sum(fn()["evaluations"]))
+        sec = time_case(fn, repeat, min_time)
+        entry = {"seconds": sec, "items_per_sec": items / sec,
+                 "peak_mb": peak_memory(fn) / 2**20}
+        if gens:
+            entry["gens_per_sec"] = gens / sec
+            entry["evals_per_sec"] = items / sec
+        key = f"{name}[{label}]"
+        results[key] = entry
+        log(f"{key:55s} {sec * 1e3:10.3f} ms  {items / sec:12.3e} /s  "
+            f"{entry['peak_mb']:8.2f} MB" + (f"  {gens / sec:9.1f} gen/s" if gens else ""))
+    return results
+
+
+# ===================== HISTORY / BASELINE =====================
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_record(results, quick):
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def append_history(record, path=HISTORY_FN):
+    history = []
+    if os.path.exists(path):
+        with open(path) as f:
+            history = json.load(f)
+    history.append(record)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(history, f, indent=1)
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Cases present in both whose seconds per call grew by more than
+    tolerance (0.2 = 20%): {key: (baseline seconds, current seconds)}.
+    """
+    slow = {}
+    for key, entry in results.items():
+        ref = baseline.get(key)
+        if ref and entry["seconds"] > ref["seconds"] * (1 + tolerance):
+            slow[key] = (ref["seconds"], entry["seconds"])
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the GA and quantum kernels.")
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    parser.add_argument("-k", dest="select", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds per timing round (default 0.2)")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="flag cases slower than baseline by this fraction (default 0.2)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the baseline")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 when a case is flagged")
+    args = parser.parse_args(argv)
+
+    cases = kernel_cases(QUICK_SIZES if args.quick else SIZES)
+    if args.select:
+        cases = [c for c in cases if args.select in c[0]]
+    results = run_cases(cases, args.repeat, args.min_time)
+    record = make_record(results, args.quick)
+    append_history(record)
+
+    if args.save_baseline:
+        with open(BASELINE_FN, "w") as f:
+            json.dump(record, f, indent=1)
+        print(f"baseline saved to {BASELINE_FN}")
+        return 0
+    if not os.path.exists(BASELINE_FN):
+        print(f"no baseline yet ({BASELINE_FN}); run with --save-baseline")
+        return 0
+
+    with open(BASELINE_FN) as f:
+        baseline = json.load(f)
+    slow = compare(results, baseline["results"], args.tolerance)
+    for key, (ref, now) in slow.items():
+        print(f"SLOWER  {key}: {ref * 1e3:.3f} ms -> {now * 1e3:.3f} ms ({now / ref:.2f}x)")
+    if not slow:
+        print(f"no case slower than baseline {baseline.get('commit')} "
+              f"by more than {args.tolerance:.0%}")
+    return 1 if slow and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Classical GA baselines and the shared GA machinery (selection, variation
+operators, batched engine, trial runner, parameter sweeps, profiling,
+history/results storage).
+
+Importing any module here runs no experiment and loads neither
+matplotlib nor tqdm. From the code/ directory:
+
+    python -m classical.twin_peaks [--headless | --render-only]
+"""
@@ -0,0 +1,140 @@
+import json
+import os
+
+import numpy as np
+
+from .rng import TrialGenerators
+
+# ============================================================
+# CHECKPOINT / RESUME
+# ------------------------------------------------------------
+# A run loop that gets a Checkpoint saves, every `every` generations,
+# everything it needs to carry on: population, fitness cache, metric
+# histories, counters, the index of the next generation and the full
+# bit-generator state of its rng. On restart the same call finds the
+# file, restores all of it and continues from that generation; the
+# remaining draws are the ones the uninterrupted run would have made,
+# so the result is bit-identical.
+#
+# One .npz per run; the rng state and generation index are stored as a
+# JSON string inside it. Writes go to a temporary file first and are
+# moved into place, so a crash mid-write keeps the previous checkpoint.
+#
+# Run loops take checkpoint=None, stop=None (stopping.py) and
+# profiler=None (profiling.py). Before their first generation they call
+#   start, saved = resume_run(checkpoint, rng, stop)
+# and put back what `saved` holds (population, fitness, histories up to
+# `start`); after each generation g
+#   save_if_due(checkpoint, g + 1, rng, stop, pop=..., ...)
+# stores the same arrays. The stopping rule's state rides along, so a
+# resumed run stops where the uninterrupted one would have.
+# ============================================================
+
+# ===================== RNG STATE =====================
+def _encode(obj):
+    if isinstance(obj, np.ndarray):
+        return {"__array__": obj.tolist(), "dtype": str(obj.dtype)}
+    if isinstance(obj, dict):
+        return {k: _encode(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode(v) for v in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+def _decode(obj):
+    if isinstance(obj, dict):
+        if "__array__" in obj:
+            return np.array(obj["__array__"], dtype=obj["dtype"])
+        return {k: _decode(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_decode(v) for v in obj]
+    return obj
+
+
+def get_rng_state(rng=None):
+    """
+    Full state of rng: None / np.random (the global legacy stream),
+    a np.random.Generator, or TrialGenerators (one state per trial).
+    """
+    if rng is None or rng is np.random:
+        return np.random.get_state(legacy=False)
+    if isinstance(rng, TrialGenerators):
+        return [g.bit_generator.state for g in rng.generators]
+    return rng.bit_generator.state
+
+
+def set_rng_state(rng, state):
+    if rng is None or rng is np.random:
+        np.random.set_state(state)
+    elif isinstance(rng, TrialGenerators):
+        for g, s in zip(rng.generators, state):
+            g.bit_generator.state = s
+    else:
+        rng.bit_generator.state = state
+
+
+# ===================== CHECKPOINT FILE =====================
+class Checkpoint:
+
+    def __init__(self, path, every=10):
+        """path: the .npz file of one run; every: generations between saves."""
+        self.path = path if path.endswith(".npz") else path + ".npz"
+        self.every = every
+
+    def due(self, gen):
+        """True when the state before generation `gen` should be saved."""
+        return self.every > 0 and gen % self.every == 0
+
+    def save(self, gen, rng, **arrays):
+        """
+        Store the state in which generation `gen` is the next to run.
+        None entries are skipped; lists are stored as arrays.
+        """
+        meta = json.dumps({"gen": gen, "rng": _encode(get_rng_state(rng))})
+        arrays = {k: np.asarray(v) for k, v in arrays.items() if v is not None}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path[:-4] + ".tmp.npz"
+        np.savez(tmp, __meta__=np.array(meta), **arrays)
+        os.replace(tmp, self.path)
+
+    def restore(self, rng):
+        """
+        (gen, arrays) from the saved checkpoint, with rng put back into
+        its saved state; (0, None) when there is nothing to resume.
+        """
+        if not os.path.exists(self.path):
+            return 0, None
+        with np.load(self.path, allow_pickle=False) as z:
+            arrays = {k: z[k] for k in z.files if k != "__meta__"}
+            meta = json.loads(str(z["__meta__"]))
+        set_rng_state(rng, _decode(meta["rng"]))
+        return meta["gen"], arrays
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# ===================== RUN-LOOP HELPERS =====================
+def resume_run(checkpoint, rng, stop=None):
+    """
+    (start, saved) for a run loop: the saved arrays with rng and the
+    stopping rule put back; (0, None) when there is nothing to resume.
+    """
+    if checkpoint is None:
+        return 0, None
+    start, saved = checkpoint.restore(rng)
+    if saved is not None and stop is not None:
+        stop.set_state(saved)
+    return start, saved
+
+
+def save_if_due(checkpoint, gen, rng, stop=None, **arrays):
+    """Save the state before generation `gen` if one is due; True if it saved."""
+    if checkpoint is None or not checkpoint.due(gen):
+        return False
+    checkpoint.save(gen, rng, **arrays, **(stop.state() if stop else {}))
+    return True
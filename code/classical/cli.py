@@ -0,0 +1,51 @@
+import argparse
+import importlib
+import sys
+
+# ============================================================
+# COMMON ENTRY POINT
+# ------------------------------------------------------------
+# Every experiment script is split into
+#   run_experiment()  numerical work only; writes summaries, the
+#                     columnar results store and population histories
+#   render()          optional post-processing; reads those files back
+#                     and draws plots / encodes animations
+# so batch jobs never import matplotlib or call ffmpeg.
+#
+# From the code/ directory:
+#   python -m classical.cli twin_peaks --headless     # numbers only
+#   python -m classical.cli twin_peaks --render-only  # figures from saved results
+#   python -m classical.twin_peaks --no-animation     # same flags per script
+# ============================================================
+
+EXPERIMENTS = ("parabola", "rastrigin_1d", "rastrigin_2d", "twin_peaks")
+
+
+def experiment_main(run_experiment, render, argv=None, description=None):
+    parser = argparse.ArgumentParser(description=description)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--headless", action="store_true",
+                      help="run the numerical experiment only (no matplotlib, plots or video)")
+    mode.add_argument("--render-only", action="store_true",
+                      help="skip the experiment and render from previously saved results")
+    parser.add_argument("--no-animation", action="store_true",
+                        help="draw static plots but skip video encoding")
+    args = parser.parse_args(argv)
+
+    if not args.render_only:
+        run_experiment()
+    if not args.headless:
+        render(animate=not args.no_animation)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in EXPERIMENTS:
+        sys.exit(f"usage: python -m classical.cli {{{','.join(EXPERIMENTS)}}} "
+                 "[--headless | --render-only] [--no-animation]")
+    module = importlib.import_module(f".{argv[0]}", __package__)
+    module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import numpy as np
+
+from .checkpoint import resume_run, save_if_due
+from .operators import blend_crossover, gaussian_mutate
+from .fused import generation_kernel
+from .profiling import lap_timer
+from .rng import TrialGenerators
+from .selection import top_k, tournament_winners
+
+# ============================================================
+# BATCHED MULTI-TRIAL GA
+# ------------------------------------------------------------
+# Same generational scheme as run_single_ga (parabola.py), run_ga
+# (rastrigin_1d.py) and run_single (twin_peaks.py), but every trial
+# lives in one row of a (trials, pop) array. Each operator is a single
+# NumPy call over the whole batch; only the random draws loop over
+# trials, so every trial keeps its own independent stream.
+#
+# In all of these loops fitness travels with the genomes: every
+# individual is evaluated once, when it is created, and elites keep
+# their scores.
+# ============================================================
+
+def run_batched_ga(
+    fitness_fn,
+    domain,
+    trials,
+    pop_size=30,
+    gens=80,
+    elitism=2,
+    tournament_k=5,
+    tournament_replace=True,
+    crossover_prob=0.4,
+    mutation_pm=0.5,
+    mutation_sigma=1.0,
+    optimum=None,
+    seed=None,
+    record_positions=False,
+    recorder=None,
+    checkpoint=None,
+    stop=None,
+    profiler=None,
+    dtype=np.float64,
+    backend="numpy",
+):
+    """
+    Evolve `trials` independent 1-D populations together.
+
+    fitness_fn must be elementwise (it receives a (trials, pop) array).
+    Trial t draws only from child t of SeedSequence(seed), so its result
+    is the same whether it runs alone or inside a larger batch.
+    tournament_replace=False matches rastrigin_1d.py's distinct-candidate
+    tournaments.
+
+    Returns (trials, gens) histories "best", "mean", "std" (position
+    spread), "dist" (|best_x - optimum|, only if optimum is given),
+    "final_pop" (trials, pop), "final_scores" (trials, pop),
+    "evaluations" (fitness calls, per trial) and optionally "positions"
+    (trials, gens, pop). Fitness is carried with the population, so each
+    individual is evaluated exactly once. For long sweeps pass a HistoryRecorder
+    (recorder.py) instead of record_positions to stream them to disk.
+    checkpoint: a Checkpoint (checkpoint.py) holding every trial's state
+    and generator; the batch resumes from it bit-identically.
+    stop: a StoppingRule (stopping.py) applied per trial. Finished
+    trials leave the working arrays (and stop drawing random numbers);
+    their histories hold the last value and "generations" /
+    "stop_reason" report when and why each trial ended.
+    profiler: a Profiler (profiling.py) for per-phase timings and the
+    on_generation / on_collapse hooks (called with the running trials).
+    dtype: float type of populations, scores and histories (np.float32
+    halves their memory traffic). Random draws stay float64, so a trial
+    makes the same draws in either precision.
+    backend: "numpy", or "numba" / "auto" to run each generation as one
+    compiled loop per trial, trials in parallel (fused.py; needs numba,
+    "auto" falls back to NumPy without it). fitness_fn must then be a
+    scalar function numba can compile, e.g. a registered 1-D Landscape.
+    Outcomes agree statistically with "numpy"; single trials may not.
+    """
+    all_rng = TrialGenerators.from_seed(seed, trials)
+    T, N, E = trials, pop_size, elitism
+
+    pop = all_rng.uniform(domain[0], domain[1], size=(T, N)).astype(dtype, copy=False)
+
+    best_hist = np.empty((T, gens), dtype=dtype)
+    mean_hist = np.empty((T, gens), dtype=dtype)
+    std_hist = np.empty((T, gens), dtype=dtype)
+    dist_hist = np.empty((T, gens), dtype=dtype) if optimum is not None else None
+    positions = np.empty((T, gens, N), dtype=dtype) if record_positions else None
+
+    scores = fitness_fn(pop).astype(dtype, copy=False)
+    n_evals = np.full(T, N)
+
+    # pop / scores hold only the trials still running (ids); finished
+    # trials are parked in final_pop / final_scores and cost nothing
+    ids = np.arange(T)
+    final_pop = np.empty((T, N), dtype=dtype)
+    final_scores = np.empty((T, N), dtype=dtype)
+    gens_run = np.zeros(T, dtype=int)
+    if stop is not None:
+        stop.start((T,))
+    if profiler is not None:
+        profiler.begin((T,))
+    lap = lap_timer(profiler)
+
+    hists = {"best": best_hist, "mean": mean_hist, "std": std_hist,
+             "dist": dist_hist, "positions": positions}
+    start, saved = resume_run(checkpoint, all_rng, stop)
+    if saved is not None:
+        pop, scores, ids = saved["pop"], saved["scores"], saved["ids"]
+        n_evals, gens_run = saved["evaluations"], saved["gens_run"]
+        final_pop[:], final_scores[:] = saved["final_pop"], saved["final_scores"]
+        for name, h in hists.items():
+            if h is not None:
+                h[:, :start] = saved[name]
+
+    # one uniform block and one normal block per trial per generation:
+    # [tournaments (N*k) | crossover pairs (2*(N//2)) | mutation mask (N)]
+    n_sel, n_cx = N * tournament_k, 2 * (N // 2)
+    width = None
+    step = generation_kernel(fitness_fn, backend)
+    lo, hi = float(domain[0]), float(domain[1])
+
+    for g in range(start, gens):
+        if len(ids) == 0:
+            break
+        if width != len(ids):
+            # (re)size the working set after trials finished
+            width = len(ids)
+            rng = TrialGenerators([all_rng.generators[i] for i in ids])
+            u = np.empty((width, n_sel + n_cx + N))
+            noise = np.empty((width, N))
+            parents = np.empty((width, N), dtype=dtype)
+            children = np.empty((width, N), dtype=dtype)
+            next_pop = np.empty((width, N), dtype=dtype)
+            next_scores = np.empty((width, N), dtype=dtype)
+            rows = np.arange(width)
+            row_offset = (rows * N)[:, None]
+
+        best_idx = scores.argmax(axis=1)
+        best_hist[ids, g] = scores[rows, best_idx]
+        mean_hist[ids, g] = scores.mean(axis=1)
+        std_hist[ids, g] = pop.std(axis=1)
+        if dist_hist is not None:
+            dist_hist[ids, g] = np.abs(pop[rows, best_idx] - optimum)
+        gens_run[ids] = g + 1
+        lap("metrics")
+        if record_positions:
+            positions[ids, g] = pop
+        if recorder is not None:
+            recorder.record(g, pop, None if width == T else ids)
+        lap("history")
+        if profiler is not None:
+            profiler.generation(g, rows=ids, trials=ids, pop=pop, scores=scores,
+                                best=best_hist[ids, g], diversity=std_hist[ids, g],
+                                evaluations=n_evals[ids])
+
+        if stop is not None:
+            done = stop.update(best_hist[ids, g], std_hist[ids, g], n_evals[ids], rows=ids)
+            if done.any():
+                final_pop[ids[done]] = pop[done]
+                final_scores[ids[done]] = scores[done]
+                if recorder is not None:
+                    recorder.finish(g, pop[done], ids[done])
+                ids, pop, scores = ids[~done], pop[~done], scores[~done]
+                if len(ids) == 0:
+                    break
+                width = len(ids)
+                rng = TrialGenerators([all_rng.generators[i] for i in ids])
+                u, noise, parents, children = u[:width], noise[:width], parents[:width], children[:width]
+                next_pop, next_scores = next_pop[:width], next_scores[:width]
+                rows = np.arange(width)
+                row_offset = row_offset[:width]
+            lap("stopping")
+
+        if step is not None:
+            # the whole generation in one compiled pass per trial (fused.py)
+            rng.random(out=u)
+            rng.standard_normal(out=noise)
+            lap("random")
+            step(pop, scores, u, noise, tournament_k, tournament_replace, crossover_prob,
+                 mutation_pm, mutation_sigma, lo, hi, E, next_pop, next_scores)
+            n_evals[ids] += N
+            pop, next_pop = next_pop, pop
+            scores, next_scores = next_scores, scores
+            lap("fused")
+        else:
+            # ---- elitism ----
+            elite_idx = top_k(scores, E)
+            elites = np.take_along_axis(pop, elite_idx, axis=1)
+            lap("elitism")
+
+            # ---- evolution ----
+            rng.random(out=u)
+            rng.standard_normal(out=noise)
+            lap("random")
+            winners = tournament_winners(scores, tournament_k, replace=tournament_replace,
+                                         u=u[:, :n_sel])
+            np.take(pop, winners + row_offset, out=parents)
+            lap("selection")
+            blend_crossover(parents, crossover_prob, out=children,
+                            u=u[:, n_sel:n_sel + n_cx])
+            lap("crossover")
+            gaussian_mutate(children, mutation_pm, mutation_sigma, domain,
+                            u=u[:, n_sel + n_cx:], noise=noise)
+            lap("mutation")
+
+            child_scores = fitness_fn(children).astype(dtype, copy=False)
+            n_evals[ids] += N
+            lap("evaluation")
+            keep = top_k(child_scores, N - E, order="position")
+            survivors = np.take_along_axis(children, keep, axis=1)
+
+            pop = np.concatenate([elites, survivors], axis=1)
+            scores = np.concatenate([np.take_along_axis(scores, elite_idx, axis=1),
+                                     np.take_along_axis(child_scores, keep, axis=1)], axis=1)
+            lap("replacement")
+
+        if save_if_due(checkpoint, g + 1, all_rng, stop, pop=pop, scores=scores, ids=ids,
+                       evaluations=n_evals, gens_run=gens_run,
+                       final_pop=final_pop, final_scores=final_scores,
+                       **{name: h[:, :g + 1] for name, h in hists.items() if h is not None}):
+            lap("checkpoint")
+
+    final_pop[ids] = pop
+    final_scores[ids] = scores
+
+    # histories of trials that stopped early hold their last value
+    if stop is not None and gens:
+        last = np.minimum(np.arange(gens), np.maximum(gens_run, 1)[:, None] - 1)
+        for h in hists.values():
+            if h is not None:
+                idx = last if h.ndim == 2 else last[..., None]
+                h[:] = np.take_along_axis(h, idx, axis=1)
+
+    out = {
+        "best": best_hist,
+        "mean": mean_hist,
+        "std": std_hist,
+        "final_pop": final_pop,
+        "final_scores": final_scores,
+        "evaluations": n_evals,
+        "positions": positions,
+    }
+    if stop is not None:
+        out["generations"] = gens_run
+        out["stop_reason"] = stop.stop_reason()
+    if dist_hist is not None:
+        out["dist"] = dist_hist
+    return out
@@ -0,0 +1,165 @@
+import functools
+
+import numpy as np
+
+# ============================================================
+# FUSED GENERATION KERNEL (OPTIONAL NUMBA BACKEND)
+# ------------------------------------------------------------
+# The NumPy generation of run_batched_ga (engine.py) is a chain of
+# whole-batch passes: tournaments, gather, crossover, mutation, clip,
+# evaluation, two top-k selections and two concatenations, each
+# writing a (trials, pop) temporary. With numba installed the same
+# generation compiles into one loop per trial that keeps its
+# individuals in a few pop-sized scratch rows, and trials run in
+# parallel (prange).
+#
+# The kernel reads the engine's per-generation random block with the
+# same layout [tournaments | crossover pairs | mutation mask] plus the
+# normal block, so a trial makes the same draws on either backend, and
+# it breaks ties by selection.top_k's rule.
+#
+# What matches is the statistics, not the trajectories. The compiled
+# fitness can differ from NumPy's in the last bit (with dtype=float32
+# NumPy evaluates in single precision, the kernel does not), which can
+# reorder or tie nearly equal individuals and send a trial elsewhere.
+# Measured on the deceptive landscape: about 0.5% of float64 trials and
+# 20% of float32 trials end with a different final population, while
+# twin_peaks basin counts over 500 trials are identical in both
+# precisions.
+#
+# numba is imported only when a kernel is requested; without it
+# backend="auto" quietly keeps the NumPy path.
+# ============================================================
+
+BACKENDS = ("numpy", "numba", "auto")
+
+
+def _build(numba, f):
+    @numba.njit
+    def _top(fit, n):
+        # indices (ascending) of the n highest scores, ties leftmost first
+        N = len(fit)
+        out = np.empty(n, dtype=np.intp)
+        if n == 0:
+            return out
+        kth = np.sort(fit)[N - n]
+        room = n
+        for i in range(N):
+            if fit[i] > kth:
+                room -= 1
+        slot = 0
+        for i in range(N):
+            if fit[i] > kth or (fit[i] == kth and room > 0):
+                if fit[i] == kth:
+                    room -= 1
+                out[slot] = i
+                slot += 1
+        return out
+
+    @numba.njit
+    def _rank(fit):
+        # scores as selection ranks them: NaN below every number
+        out = fit.astype(np.float64)
+        for i in range(len(out)):
+            if np.isnan(out[i]):
+                out[i] = -np.inf
+        return out
+
+    @numba.njit(parallel=True)
+    def step(pop, scores, u, noise, k, replace, pc, pm, sigma, lo, hi, E, out_pop, out_scores):
+        T, N = pop.shape
+        n_sel, P = N * k, N // 2
+        n_cx = 2 * P
+        for t in numba.prange(T):
+            row, fit, ut = pop[t], scores[t], u[t]
+            rank = _rank(fit)
+            children = np.empty_like(row)
+            child_fit = np.empty_like(fit)
+            cand = np.empty(k, dtype=np.intp)
+
+            # ---- tournaments (selection.tournament_indices) ----
+            for s in range(N):
+                base = s * k
+                for i in range(k):
+                    if replace:
+                        c = min(int(ut[base + i] * N), N - 1)
+                    else:
+                        # Floyd's subset sampling: k distinct candidates
+                        j = N - k + i
+                        c = min(int(ut[base + i] * (j + 1)), j)
+                        for q in range(i):
+                            if cand[q] == c:
+                                c = j
+                                break
+                    cand[i] = c
+                best = cand[0]
+                for i in range(1, k):
+                    if rank[cand[i]] > rank[best]:
+                        best = cand[i]
+                children[s] = row[best]
+
+            # ---- blend crossover of pairs (2p, 2p+1), in place ----
+            for p in range(P):
+                if ut[n_sel + 2 * p] < pc:
+                    a, b = children[2 * p], children[2 * p + 1]
+                    children[2 * p] = (a - b) * ut[n_sel + 2 * p + 1] + b
+                    children[2 * p + 1] = (a + b) - children[2 * p]
+
+            # ---- mutation, clip, evaluation ----
+            for i in range(N):
+                x = children[i]
+                if ut[n_sel + n_cx + i] < pm:
+                    x += noise[t, i] * sigma
+                x = min(max(x, lo), hi)
+                children[i] = x
+                child_fit[i] = f(children[i])
+
+            # ---- elites, then the best N - E children (selection.top_k:
+            # ties with the cut-off kept leftmost first) ----
+            elite = _top(rank, E)
+            elite = elite[np.argsort(rank[elite], kind="mergesort")]
+            for e in range(E):
+                out_pop[t, e] = row[elite[e]]
+                out_scores[t, e] = fit[elite[e]]
+            survivors = _top(_rank(child_fit), N - E)
+            for e in range(N - E):
+                out_pop[t, E + e] = children[survivors[e]]
+                out_scores[t, E + e] = child_fit[survivors[e]]
+
+    return step
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(fitness_fn):
+    try:
+        import numba
+    except ImportError:
+        return None
+    f = numba.njit(getattr(fitness_fn, "fn", fitness_fn))
+    f(0.0)  # compile now: an unsupported fitness fails here, not mid-run
+    return _build(numba, f)
+
+
+def generation_kernel(fitness_fn, backend="auto"):
+    """
+    Compiled generation step for a scalar fitness function (or a 1-D
+    Landscape), or None for the NumPy path.
+
+    backend: "numpy"; "numba" (ImportError without numba, numba's
+    error if fitness_fn does not compile); "auto" (numba when it is
+    installed and fitness_fn compiles, else NumPy).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; known: {BACKENDS}")
+    if backend == "numpy":
+        return None
+    try:
+        step = _compile(fitness_fn)
+    except Exception:
+        # numba is there but cannot compile this fitness function
+        if backend == "numba":
+            raise
+        return None
+    if step is None and backend == "numba":
+        raise ImportError("backend='numba' needs the numba package")
+    return step
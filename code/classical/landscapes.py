@@ -0,0 +1,149 @@
+import numpy as np
+
+# ============================================================
+# FITNESS LANDSCAPE REGISTRY
+# ------------------------------------------------------------
+# One definition per landscape, shared by the GA scripts, the batched
+# engines and the quantum grid code. A Landscape evaluates batches
+# over arbitrary leading axes, knows its domain, optimum and basins,
+# and caches dense grid evaluations (xs_dense/fs_dense, the 300x300
+# contour mesh, the quantum x_grid) so each is computed once.
+#
+# Evaluators keep the float type of their input (constants are Python
+# scalars), so float32 populations give float32 fitness.
+# ============================================================
+
+A = 10.0
+
+# ===================== RAW FUNCTIONS =====================
+def parabola(x):
+    return 10 - x**2
+
+def rastrigin_1d_dense(x, k=4, A=10.0):
+    """
+    k = ripple frequency multiplier
+    Higher k → more local optima per unit length
+    """
+    return A - (x**2 - A * np.cos(2 * np.pi * k * x))
+
+def rastrigin(X, A=A):
+    """
+    X: (..., D)
+    returns: (...)
+    Global optimum at the origin with fitness D*A (2A for the 2-D case)
+    """
+    D = X.shape[-1]
+    ripple = np.multiply(X, 2 * np.pi)
+    np.cos(ripple, out=ripple)
+    return D * A - (np.einsum("...i,...i->...", X, X) - A * ripple.sum(axis=-1))
+
+def deceptive(x):
+    return (
+        8 * np.exp(-(x + 4)**2 / 1.5)    # wide local trap
+        + 10 * np.exp(-(x - 2)**2 / 0.2) # narrow global optimum
+    )
+
+def twin_peaks(x):
+    return 10*np.exp(-(x-3)**2) + 5*np.exp(-(x+3)**2)
+
+# ===================== LANDSCAPE OBJECTS =====================
+class Landscape:
+    """
+    fn: elementwise for dim=1 (any shape), else maps (..., dim) -> (...).
+    optimum: location of the global maximum (scalar for dim=1).
+    basins: {label: predicate(x) -> bool mask}; points matching none
+    are labelled "other" by classify().
+    """
+
+    def __init__(self, name, fn, domain, dim=1, optimum=None, basins=None):
+        self.name = name
+        self.fn = fn
+        self.domain = domain
+        self.dim = dim
+        self.optimum = optimum
+        self.basins = dict(basins or {})
+        self._grids = {}
+
+    def __call__(self, x):
+        return self.fn(x)
+
+    def __repr__(self):
+        return f"Landscape({self.name!r}, domain={self.domain}, dim={self.dim})"
+
+    @property
+    def optimum_value(self):
+        if self.optimum is None:
+            return None
+        x = np.asarray(self.optimum, dtype=float)
+        return float(self.fn(x) if self.dim == 1 else self.fn(x[None])[0])
+
+    def grid(self, n, dtype=np.float64):
+        """
+        Cached dense evaluation with n points per axis (read-only arrays),
+        one cache entry per (n, dtype).
+
+        dim=1: (xs, fs) with xs = linspace(*domain, n).
+        dim>1: ((X, Y, ...), Z) from np.meshgrid (indexing="xy"), ready
+        for contour plots.
+        """
+        key = (n, np.dtype(dtype))
+        if key not in self._grids:
+            axis = np.linspace(self.domain[0], self.domain[1], n, dtype=dtype)
+            if self.dim == 1:
+                pts, vals = axis, self.fn(axis)
+            else:
+                pts = np.meshgrid(*([axis] * self.dim))
+                vals = self.fn(np.stack(pts, axis=-1))
+                pts = tuple(pts)
+            for a in (pts if self.dim > 1 else (pts,)) + (vals,):
+                a.setflags(write=False)
+            self._grids[key] = (pts, vals)
+        return self._grids[key]
+
+    def classify(self, x):
+        """Basin label for each point of x (a str for a single point)."""
+        x = np.asarray(x)
+        labels = np.full(x.shape[:x.ndim - (self.dim > 1)], "other", dtype=object)
+        for label, inside in reversed(list(self.basins.items())):
+            labels[inside(x)] = label
+        return labels[()] if labels.ndim == 0 else labels
+
+# ===================== REGISTRY =====================
+LANDSCAPES = {}
+
+def register(landscape):
+    LANDSCAPES[landscape.name] = landscape
+    return landscape
+
+def get_landscape(name):
+    try:
+        return LANDSCAPES[name]
+    except KeyError:
+        raise KeyError(f"unknown landscape {name!r}; known: {sorted(LANDSCAPES)}") from None
+
+
+register(Landscape("parabola", parabola, (-5, 5), optimum=0.0))
+register(Landscape("rastrigin_1d", rastrigin_1d_dense, (-5.12, 5.12), optimum=0.0))
+register(Landscape("rastrigin_2d", rastrigin, (-5.12, 5.12), dim=2, optimum=np.zeros(2)))
+
+def _deceptive_landscape():
+    # peaks located numerically on the same 5000-point grid twin_peaks.py
+    # used; basins are +-0.5 around each peak (classify_run)
+    land = Landscape("deceptive", deceptive, (-8, 8))
+    xs_dense, fs_dense = land.grid(5000)
+    global_x = xs_dense[np.argmax(fs_dense)]
+    mask = np.abs(xs_dense - global_x) > 1.0
+    local_x = xs_dense[mask][np.argmax(fs_dense[mask])]
+    land.optimum = float(global_x)
+    land.local_optimum = float(local_x)
+    land.basins = {
+        "global": lambda x: np.abs(x - global_x) < 0.5,
+        "local": lambda x: np.abs(x - local_x) < 0.5,
+    }
+    return land
+
+register(_deceptive_landscape())
+register(Landscape("twin_peaks", twin_peaks, (-6.0, 6.0), optimum=3.0, basins={
+    "left": lambda x: x < 0,
+    "right": lambda x: x >= 0,
+}))
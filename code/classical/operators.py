@@ -0,0 +1,99 @@
+import numpy as np
+
+from .rng import normal_block, uniform_block
+
+# ============================================================
+# VECTORIZED VARIATION OPERATORS
+# ------------------------------------------------------------
+# `axis` is the population axis and must be negative: axis=-1 for
+# scalar genomes (N,) / (trials, N), axis=-2 for vector genomes
+# (N, D) / (trials, N, D). Axes before it are batch axes; axes after
+# it are genome axes. Children are written into `out`, so a caller
+# that keeps its buffers across generations allocates no
+# population-sized arrays here.
+#
+# rng / u / noise follow the conventions in rng.py.
+# ============================================================
+
+def _split(shape, axis):
+    if axis >= 0:
+        raise ValueError("axis must be negative (population axis counted from the end)")
+    return shape[:axis], shape[axis], shape[axis:][1:]
+
+
+def blend_crossover(parents, pc, rng=None, out=None, axis=-1, both=True, u=None):
+    """
+    Arithmetic blend of consecutive pairs (0,1), (2,3), ... with
+    probability pc and one alpha ~ U(0,1) per pair:
+
+        c0 = alpha*a + (1-alpha)*b,   c1 = (1-alpha)*a + alpha*b
+
+    Pairs that do not cross are copied. both=False returns only c0 per
+    pair (N//2 children). An odd last individual is copied through.
+    out must not overlap parents. u: (*batch, N//2, 2) pre-drawn uniforms.
+    """
+    batch, n, genome = _split(parents.shape, axis)
+    P = n // 2
+    n_out = n if both else P
+    if out is None:
+        out = np.empty(batch + (n_out,) + genome, dtype=parents.dtype)
+    elif np.shares_memory(out, parents):
+        raise ValueError("out must not overlap parents")
+
+    pad = (slice(None),) * len(genome)
+    a = parents[(Ellipsis, slice(0, 2 * P, 2)) + pad]
+    b = parents[(Ellipsis, slice(1, 2 * P, 2)) + pad]
+    c0 = out[(Ellipsis, slice(0, 2 * P, 2)) + pad] if both else out[(Ellipsis, slice(0, P)) + pad]
+
+    u = uniform_block(batch + (P, 2), rng, u)
+    bshape = batch + (P,) + (1,) * len(genome)
+    keep = (u[..., 0] >= pc).reshape(bshape)
+    alpha = u[..., 1].reshape(bshape)
+
+    # c0 = b + alpha*(a - b)
+    np.subtract(a, b, out=c0)
+    np.multiply(c0, alpha, out=c0)
+    np.add(c0, b, out=c0)
+    np.copyto(c0, a, where=keep)
+    if not both:
+        return out
+
+    # c1 = a + b - c0
+    c1 = out[(Ellipsis, slice(1, 2 * P, 2)) + pad]
+    np.add(a, b, out=c1)
+    np.subtract(c1, c0, out=c1)
+    np.copyto(c1, b, where=keep)
+
+    if n % 2:
+        out[(Ellipsis, n - 1) + pad] = parents[(Ellipsis, n - 1) + pad]
+    return out
+
+
+def gaussian_mutate(pop, pm, sigma, domain=None, rng=None, out=None, axis=-1,
+                    u=None, noise=None):
+    """
+    With probability pm per individual add N(0, sigma^2) noise to its
+    whole genome, then clip to domain. out defaults to pop (in place).
+
+    u: (*batch, N) pre-drawn uniforms. noise: pop-shaped pre-drawn
+    standard normals (scaled in place, so it is consumed). Without noise,
+    only the mutated individuals draw normals, which matters when genomes
+    are long and pm is small.
+    """
+    batch, n, genome = _split(pop.shape, axis)
+    if out is None:
+        out = pop
+    elif out is not pop:
+        np.copyto(out, pop)
+
+    hit = uniform_block(batch + (n,), rng, u) < pm
+    if noise is None:
+        out[hit] += sigma * normal_block((int(hit.sum()),) + genome, rng)
+    else:
+        noise = noise.reshape(pop.shape)
+        np.multiply(noise, sigma, out=noise)
+        np.add(out, noise, out=out, where=hit.reshape(batch + (n,) + (1,) * len(genome)))
+
+    if domain is not None:
+        np.clip(out, domain[0], domain[1], out=out)
+    return out
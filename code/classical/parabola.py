@@ -1,14 +1,18 @@
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import animation
-from tqdm import trange
 import json, os
 
+from .checkpoint import resume_run, save_if_due
+from .cli import experiment_main
+from .landscapes import get_landscape
+from .operators import blend_crossover as blend_pairs, gaussian_mutate
+from .profiling import lap_timer
+from .recorder import HistoryRecorder, load_history
+from .results_store import ResultsStore
+from .selection import top_k, tournament_winners
+
 # ----- Config -----
-np.random.seed(34)
 OUTDIR = "part1_results"
-os.makedirs(OUTDIR, exist_ok=True)
 
 # GA hyperparams (tweak later if needed)
 POP_SIZE = 30
@@ -20,116 +24,174 @@ MUTATION_PM = 0.5
 MUTATION_SIGMA = 1
 TRIALS = 10
 DOMAIN = (-5, 5)
+POSITIONS_FN = os.path.join(OUTDIR, "parabola_positions.npy")
+RUNS_DIR = os.path.join(OUTDIR, "parabola_runs")
 
 # ----- Landscape (parabola) -----
-def fitness_simple(x):
-    return 10 - x**2
+fitness_simple = get_landscape("parabola")
 
 # ----- GA primitives (clean, reproducible) -----
-def init_pop(N, domain):
-    return np.random.uniform(domain[0], domain[1], size=N)
+def init_pop(N, domain, rng=None):
+    if rng is None:
+        rng = np.random
+    return rng.uniform(domain[0], domain[1], size=N)
 
 def evaluate(pop, fitness_fn):
     return fitness_fn(pop)
 
-def tournament_select(pop, scores, k=3):
-    N = pop.size
-    parents = []
-    for _ in range(N):
-        idx = np.random.randint(0, N, size=k)
-        winner = idx[np.argmax(scores[idx])]
-        parents.append(pop[winner])
-    return np.array(parents)
-
-def blend_crossover(parents, pc=0.8):
-    N = parents.size
-    children = parents.copy()
-    for i in range(0, N - 1, 2):
-        if np.random.rand() < pc:
-            a, b = parents[i], parents[i+1]
-            alpha = np.random.rand()
-            children[i]   = alpha*a + (1-alpha)*b
-            children[i+1] = (1-alpha)*a + alpha*b
-    return children
-
-def mutate(children, pm=0.2, sigma=0.3, domain=None):
-    mask = np.random.rand(children.size) < pm
-    children[mask] += np.random.normal(0, sigma, size=mask.sum())
-    if domain is not None:
-        children = np.clip(children, domain[0], domain[1])
-    return children
-
-def run_single_ga(fitness_fn, domain, seed=None, record_positions=True):
-    if seed is not None:
+def tournament_select(pop, scores, k=3, rng=None):
+    return pop[tournament_winners(scores, k, rng=rng)]
+
+def blend_crossover(parents, pc=0.8, rng=None):
+    return blend_pairs(parents, pc, rng)
+
+def mutate(children, pm=0.2, sigma=0.3, domain=None, rng=None):
+    return gaussian_mutate(children, pm, sigma, domain, rng)
+
+def run_single_ga(fitness_fn, domain, seed=None, record_positions=True, rng=None,
+                  recorder=None, trial=0, checkpoint=None, stop=None, profiler=None):
+    # rng: a per-trial np.random.Generator (see runner.py); overrides seed
+    # recorder: a HistoryRecorder (recorder.py); positions go to row `trial` on disk
+    # checkpoint / stop / profiler: the run-loop protocol in checkpoint.py
+    if rng is None and seed is not None:
         np.random.seed(seed)
-    pop = init_pop(POP_SIZE, domain)
+    pop = init_pop(POP_SIZE, domain, rng)
     best_hist = []
     mean_hist = []
     std_hist = []
     positions = [] if record_positions else None
 
-    for gen in range(GENS):
-        scores = evaluate(pop, fitness_fn)
+    scores = evaluate(pop, fitness_fn)
+    n_evals = pop.size
+
+    if stop is not None:
+        stop.start()
+    if profiler is not None:
+        profiler.begin()
+    lap = lap_timer(profiler)
+
+    start, saved = resume_run(checkpoint, rng, stop)
+    if saved is not None:
+        pop, scores, n_evals = saved["pop"], saved["scores"], int(saved["evaluations"])
+        best_hist, mean_hist, std_hist = (list(saved[k]) for k in ("best", "mean", "std"))
+        if record_positions:
+            positions = list(saved["positions"])
+
+    for gen in range(start, GENS):
         best_hist.append(scores.max())
         mean_hist.append(scores.mean())
         std_hist.append(scores.std())
+        lap("metrics")
         if record_positions:
             positions.append(pop.copy())
+        if recorder is not None:
+            recorder.record(gen, pop, trial)
+        lap("history")
+        if profiler is not None:
+            profiler.generation(gen, trial=trial, pop=pop, scores=scores, best=best_hist[-1],
+                                diversity=pop.std(), evaluations=n_evals)
+        if stop is not None:
+            done = stop.update(best_hist[-1], pop.std(), n_evals)
+            lap("stopping")
+            if done:
+                if recorder is not None:
+                    recorder.finish(gen, pop, trial)
+                break
 
         # elitism
-        elites_idx = np.argsort(scores)[-ELITISM:]
+        elites_idx = top_k(scores, ELITISM)
         elites = pop[elites_idx]
+        lap("elitism")
 
         # selection/crossover/mutation
-        parents = tournament_select(pop, scores, k=TOURNAMENT_K)
-        children = blend_crossover(parents, pc=CROSSOVER_PROB)
-        children = mutate(children, pm=MUTATION_PM, sigma=MUTATION_SIGMA, domain=domain)
+        parents = tournament_select(pop, scores, k=TOURNAMENT_K, rng=rng)
+        lap("selection")
+        children = blend_crossover(parents, pc=CROSSOVER_PROB, rng=rng)
+        lap("crossover")
+        children = mutate(children, pm=MUTATION_PM, sigma=MUTATION_SIGMA, domain=domain, rng=rng)
+        lap("mutation")
 
         # choose best children to fill population (keeps improvement pressure)
         child_scores = evaluate(children, fitness_fn)
-        best_children_idx = np.argsort(child_scores)[- (POP_SIZE - ELITISM):]
+        n_evals += children.size
+        lap("evaluation")
+        best_children_idx = top_k(child_scores, POP_SIZE - ELITISM, order="position")
         pop = np.concatenate([elites, children[best_children_idx]])
+        scores = np.concatenate([scores[elites_idx], child_scores[best_children_idx]])
+        lap("replacement")
+
+        if save_if_due(checkpoint, gen + 1, rng, stop, pop=pop, scores=scores,
+                       evaluations=n_evals, best=best_hist, mean=mean_hist, std=std_hist,
+                       positions=positions):
+            lap("checkpoint")
 
     return {
         "best": np.array(best_hist),
         "mean": np.array(mean_hist),
         "std": np.array(std_hist),
-        "positions": positions
+        "positions": positions,
+        "evaluations": n_evals,
+        "generations": len(best_hist),
+        "stop_reason": stop.stop_reason() if stop else None
     }
 
 # ----- Run TRIALS and compute metrics -----
+def landscape_grid():
+    return fitness_simple.grid(2001)
+
 def run_trials_parabola(trials=10):
-    xs = np.linspace(DOMAIN[0], DOMAIN[1], 2001)
-    fs = fitness_simple(xs)
+    from tqdm import trange
+
+    xs, fs = landscape_grid()
     global_max = fs.max()
     success_thresh = global_max - 1e-6
 
     runs = []
     success = 0
-    for t in trange(trials, desc="Parabola trials"):
-        seed = 1000 + t
-        res = run_single_ga(fitness_simple, DOMAIN, seed=seed, record_positions=True)
-        runs.append(res)
-        if res["best"][-1] >= success_thresh:
-            success += 1
+    with HistoryRecorder(POSITIONS_FN, trials, GENS, POP_SIZE) as rec:
+        for t in trange(trials, desc="Parabola trials"):
+            seed = 1000 + t
+            res = run_single_ga(fitness_simple, DOMAIN, seed=seed, record_positions=False,
+                                recorder=rec, trial=t)
+            runs.append(res)
+            if res["best"][-1] >= success_thresh:
+                success += 1
 
     summary = {
         "global_max": float(global_max),
         "success_rate": success / trials,
         "trials": trials
     }
-    return {"runs": runs, "summary": summary, "xs": xs.tolist(), "fs": fs.tolist()}
-
-results = run_trials_parabola(TRIALS)
-
-# ----- Save numeric summary -----
-with open(os.path.join(OUTDIR, "parabola_summary.json"), "w") as f:
-    json.dump(results["summary"], f, indent=2)
+    return {"runs": runs, "summary": summary}
+
+def run_experiment():
+    np.random.seed(34)
+    os.makedirs(OUTDIR, exist_ok=True)
+    results = run_trials_parabola(TRIALS)
+
+    # ----- Save numeric summary -----
+    with open(os.path.join(OUTDIR, "parabola_summary.json"), "w") as f:
+        json.dump(results["summary"], f, indent=2)
+
+    # ----- Save per-trial metrics (columnar) -----
+    ResultsStore(RUNS_DIR, mode="w").append(
+        seed=1000 + np.arange(TRIALS),
+        best=np.array([r["best"] for r in results["runs"]]),
+        mean=np.array([r["mean"] for r in results["runs"]]),
+        std=np.array([r["std"] for r in results["runs"]]),
+        pop_size=POP_SIZE, gens=GENS, elitism=ELITISM, tournament_k=TOURNAMENT_K,
+        crossover_prob=CROSSOVER_PROB, mutation_pm=MUTATION_PM, mutation_sigma=MUTATION_SIGMA,
+    )
+
+    # ----- Print concise report -----
+    print("Parabola summary:", results["summary"])
+    return results["summary"]
 
 # ----- Plot aggregated metrics -----
-def plot_aggregate(runs, title):
-    G = runs[0]["best"].size
-    best_matrix = np.array([r["best"] for r in runs])
+def plot_aggregate(best_matrix, title):
+    import matplotlib.pyplot as plt
+
+    G = best_matrix.shape[1]
     median = np.median(best_matrix, axis=0)
     q1 = np.percentile(best_matrix, 25, axis=0)
     q3 = np.percentile(best_matrix, 75, axis=0)
@@ -141,11 +203,11 @@ def plot_aggregate(runs, title):
     plt.savefig(os.path.join(OUTDIR, "parabola_aggregate.png"))
     plt.show()
 
-plot_aggregate(results["runs"], "Parabola: Best Fitness (median over trials)")
-
 # ----- Animation for the first trial -----
-def make_animation_one_run(run, xs, fs, filename):
-    positions = run["positions"]
+def make_animation_one_run(positions, xs, fs, filename):
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
     G = len(positions)
     fig, ax = plt.subplots(figsize=(8,4))
     ax.plot(xs, fs, '-k', lw=1)
@@ -163,12 +225,22 @@ def make_animation_one_run(run, xs, fs, filename):
     anim.save(filename, writer='ffmpeg', dpi=150)
     plt.close(fig)
 
-# Save animation for run 0
-anim_fn = os.path.join(OUTDIR, "parabola_run0.mp4")
-make_animation_one_run(results["runs"][0], np.array(results["xs"]), np.array(results["fs"]), anim_fn)
-
-# ----- Print concise report -----
-print("Parabola summary:", results["summary"])
-print("Saved: ", os.path.join(OUTDIR, "parabola_aggregate.png"))
-print("Saved animation (run 0):", anim_fn)
-
+def render(animate=True):
+    """Post-processing: figures and video from the files run_experiment wrote."""
+    best = ResultsStore(RUNS_DIR).load("best")["best"]
+    plot_aggregate(best, "Parabola: Best Fitness (median over trials)")
+    print("Saved: ", os.path.join(OUTDIR, "parabola_aggregate.png"))
+
+    if animate:
+        # Save animation for run 0
+        anim_fn = os.path.join(OUTDIR, "parabola_run0.mp4")
+        history, _ = load_history(POSITIONS_FN)
+        xs, fs = landscape_grid()
+        make_animation_one_run(history[0, :, :, 0], xs, fs, anim_fn)
+        print("Saved animation (run 0):", anim_fn)
+
+def main(argv=None):
+    experiment_main(run_experiment, render, argv, "Parabola GA baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+
+# ============================================================
+# PER-GENERATION PROFILING AND HOOKS
+# ------------------------------------------------------------
+# A run loop that gets a Profiler charges the wall time between
+# consecutive lap() calls to the phase named in each call:
+#   exploration  metrics  history  callbacks  stopping
+#   elitism  random  selection  crossover  mutation  evaluation
+#   replacement  checkpoint  fused
+# (only the phases that loop has). seconds / calls accumulate over
+# every generation and every run the profiler is handed to, so one
+# Profiler passed to all trials of an experiment profiles all of it.
+#
+# The loops look up `lap = lap_timer(profiler)` once; without a
+# profiler that is a no-op and nothing is timed.
+#
+# Hooks, called once per generation after the metrics are recorded:
+#   on_generation(gen, info)  info: "pop", "scores", "best",
+#                             "diversity", "evaluations" and "trial"
+#                             (one run) or "trials" (batch rows)
+#   on_collapse(gen, info)    when a run enters collapse: its loop's own
+#                             detector where it has one (hybrid_ga),
+#                             otherwise diversity < collapse_std.
+#                             info["collapsed"] marks the rows that just
+#                             collapsed; a run that recovers can fire again.
+# ============================================================
+
+def _skip(phase):
+    pass
+
+
+def lap_timer(profiler):
+    """profiler.lap, or a no-op when profiler is None."""
+    return _skip if profiler is None else profiler.lap
+
+
+class Profiler:
+
+    def __init__(self, on_generation=None, on_collapse=None, collapse_std=None):
+        self.on_generation = on_generation
+        self.on_collapse = on_collapse
+        self.collapse_std = collapse_std
+        self.seconds = {}
+        self.calls = {}
+        self.generations = 0
+        self.runs = 0
+        self._collapsed = np.zeros((), dtype=bool)
+        self._t = time.perf_counter()
+
+    def begin(self, shape=()):
+        """Start a run (shape=()) or a batch of trials (shape=(trials,))."""
+        self.runs += 1
+        self._collapsed = np.zeros(shape, dtype=bool)
+        self._t = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to `phase`."""
+        now = time.perf_counter()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + now - self._t
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self._t = now
+
+    def generation(self, gen, rows=None, collapsed=None, **info):
+        """
+        Run the hooks for generation `gen`. rows: the batch trials the
+        info arrays belong to (default: all); collapsed: the loop's own
+        collapse flags for them, if it has a detector.
+        """
+        self.generations += 1
+        if self.on_generation is not None:
+            self.on_generation(gen, info)
+        if self.on_collapse is not None:
+            if collapsed is None and self.collapse_std is not None:
+                collapsed = np.asarray(info["diversity"]) < self.collapse_std
+            if collapsed is not None:
+                sel = Ellipsis if rows is None else rows
+                entered = collapsed & ~self._collapsed[sel]
+                self._collapsed[sel] = collapsed
+                if entered.any():
+                    self.on_collapse(gen, dict(info, collapsed=entered))
+        self.lap("callbacks")
+
+    def summary(self):
+        """{phase: {"seconds", "calls", "share"}}, slowest phase first."""
+        total = sum(self.seconds.values()) or 1.0
+        order = sorted(self.seconds, key=self.seconds.get, reverse=True)
+        return {p: {"seconds": self.seconds[p], "calls": self.calls[p],
+                    "share": self.seconds[p] / total} for p in order}
+
+    def report(self):
+        """The summary as a printable table."""
+        lines = [f"{self.runs} run(s), {self.generations} generation(s)",
+                 f"{'phase':12s} {'calls':>8s} {'total ms':>10s} {'us/call':>9s} {'share':>6s}"]
+        for phase, s in self.summary().items():
+            lines.append(f"{phase:12s} {s['calls']:8d} {s['seconds'] * 1e3:10.2f} "
+                         f"{s['seconds'] / s['calls'] * 1e6:9.1f} {s['share']:6.1%}")
+        return "\n".join(lines)
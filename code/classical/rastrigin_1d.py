@@ -1,14 +1,19 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import animation
-from tqdm import trange
 import os, json
 
-# ================= CONFIG =================
-np.random.seed(34)
+from .checkpoint import resume_run, save_if_due
+from .cli import experiment_main
+from .landscapes import get_landscape, rastrigin_1d_dense
+from .operators import blend_crossover as blend_pairs, gaussian_mutate
+from .profiling import lap_timer
+from .recorder import HistoryRecorder, load_history
+from .results_store import ResultsStore
+from .selection import top_k, tournament_winners
 
+# ================= CONFIG =================
 OUTDIR = "part3_results"
-os.makedirs(OUTDIR, exist_ok=True)
+POSITIONS_FN = os.path.join(OUTDIR, "rastrigin_positions.npy")
+RUNS_DIR = os.path.join(OUTDIR, "rastrigin_runs")
 
 POP_SIZE = 40
 GENS = 120
@@ -22,50 +27,38 @@ DOMAIN = (-5.12, 5.12)   # Standard Rastrigin domain
 A = 10
 
 # ================= LANDSCAPE =================
-def rastrigin_1d_dense(x, k=4, A=10.0):
-    """
-    k = ripple frequency multiplier
-    Higher k → more local optima per unit length
-    """
-    return A - (x**2 - A * np.cos(2 * np.pi * k * x))
+# rastrigin_1d_dense(x, k=4, A=10.0) lives in landscapes.py
+LANDSCAPE = get_landscape("rastrigin_1d")
 
 
 # ================= GA PRIMITIVES =================
-def init_population(N, domain):
-    return np.random.uniform(domain[0], domain[1], size=N)
+def init_population(N, domain, rng=None):
+    if rng is None:
+        rng = np.random
+    return rng.uniform(domain[0], domain[1], size=N)
 
 def evaluate(pop):
     return rastrigin_1d_dense(pop)
 
-def tournament_selection(pop, scores, k):
-    N = len(pop)
-    parents = []
-    for _ in range(N):
-        idx = np.random.choice(N, k, replace=False)
-        parents.append(pop[idx[np.argmax(scores[idx])]])
-    return np.array(parents)
-
-def blend_crossover(parents, pc):
-    children = parents.copy()
-    for i in range(0, len(parents)-1, 2):
-        if np.random.rand() < pc:
-            a, b = parents[i], parents[i+1]
-            alpha = np.random.rand()
-            children[i]   = alpha*a + (1-alpha)*b
-            children[i+1] = (1-alpha)*a + alpha*b
-    return children
-
-def mutate(children, pm, sigma, domain):
-    mask = np.random.rand(len(children)) < pm
-    children[mask] += np.random.normal(0, sigma, size=mask.sum())
-    return np.clip(children, domain[0], domain[1])
+def tournament_selection(pop, scores, k, rng=None):
+    return pop[tournament_winners(scores, k, replace=False, rng=rng)]
+
+def blend_crossover(parents, pc, rng=None):
+    return blend_pairs(parents, pc, rng)
+
+def mutate(children, pm, sigma, domain, rng=None):
+    return gaussian_mutate(children, pm, sigma, domain, rng)
 
 # ================= SINGLE RUN =================
-def run_ga(seed=None, record_positions=True):
-    if seed is not None:
+def run_ga(seed=None, record_positions=True, rng=None, recorder=None, trial=0,
+           checkpoint=None, stop=None, profiler=None):
+    # rng: a per-trial np.random.Generator (see runner.py); overrides seed
+    # recorder: a HistoryRecorder (recorder.py); positions go to row `trial` on disk
+    # checkpoint / stop / profiler: the run-loop protocol in checkpoint.py
+    if rng is None and seed is not None:
         np.random.seed(seed)
 
-    pop = init_population(POP_SIZE, DOMAIN)
+    pop = init_population(POP_SIZE, DOMAIN, rng)
 
     best_hist = []
     mean_hist = []
@@ -73,9 +66,24 @@ def run_ga(seed=None, record_positions=True):
     dist_hist = []
     positions = [] if record_positions else None
 
-    for gen in range(GENS):
-        scores = evaluate(pop)
+    scores = evaluate(pop)
+    n_evals = len(pop)
+
+    if stop is not None:
+        stop.start()
+    if profiler is not None:
+        profiler.begin()
+    lap = lap_timer(profiler)
 
+    start, saved = resume_run(checkpoint, rng, stop)
+    if saved is not None:
+        pop, scores, n_evals = saved["pop"], saved["scores"], int(saved["evaluations"])
+        best_hist, mean_hist, std_hist, dist_hist = (
+            list(saved[k]) for k in ("best", "mean", "std", "dist"))
+        if record_positions:
+            positions = list(saved["positions"])
+
+    for gen in range(start, GENS):
         best_idx = np.argmax(scores)
         best_x = pop[best_idx]
 
@@ -83,39 +91,100 @@ def run_ga(seed=None, record_positions=True):
         mean_hist.append(scores.mean())
         std_hist.append(pop.std())
         dist_hist.append(abs(best_x - 0.0))
+        lap("metrics")
 
         if record_positions:
             positions.append(pop.copy())
+        if recorder is not None:
+            recorder.record(gen, pop, trial)
+        lap("history")
+        if profiler is not None:
+            profiler.generation(gen, trial=trial, pop=pop, scores=scores, best=best_hist[-1],
+                                diversity=std_hist[-1], evaluations=n_evals)
+        if stop is not None:
+            done = stop.update(best_hist[-1], std_hist[-1], n_evals)
+            lap("stopping")
+            if done:
+                if recorder is not None:
+                    recorder.finish(gen, pop, trial)
+                break
 
         # ---- elitism ----
-        elite_idx = np.argsort(scores)[-ELITISM:]
+        elite_idx = top_k(scores, ELITISM)
         elites = pop[elite_idx]
+        lap("elitism")
 
         # ---- evolution ----
-        parents = tournament_selection(pop, scores, TOURNAMENT_K)
-        children = blend_crossover(parents, CROSSOVER_PROB)
-        children = mutate(children, MUTATION_PM, MUTATION_SIGMA, DOMAIN)
+        parents = tournament_selection(pop, scores, TOURNAMENT_K, rng)
+        lap("selection")
+        children = blend_crossover(parents, CROSSOVER_PROB, rng)
+        lap("crossover")
+        children = mutate(children, MUTATION_PM, MUTATION_SIGMA, DOMAIN, rng)
+        lap("mutation")
 
         child_scores = evaluate(children)
-        best_children_idx = np.argsort(child_scores)[-(POP_SIZE - ELITISM):]
+        n_evals += len(children)
+        lap("evaluation")
+        best_children_idx = top_k(child_scores, POP_SIZE - ELITISM, order="position")
 
         pop = np.concatenate([elites, children[best_children_idx]])
+        scores = np.concatenate([scores[elite_idx], child_scores[best_children_idx]])
+        lap("replacement")
+
+        if save_if_due(checkpoint, gen + 1, rng, stop, pop=pop, scores=scores,
+                       evaluations=n_evals, best=best_hist, mean=mean_hist, std=std_hist,
+                       dist=dist_hist, positions=positions):
+            lap("checkpoint")
 
     return {
         "best": np.array(best_hist),
         "mean": np.array(mean_hist),
         "std":  np.array(std_hist),
         "dist": np.array(dist_hist),
-        "positions": positions
+        "positions": positions,
+        "evaluations": n_evals,
+        "generations": len(best_hist),
+        "stop_reason": stop.stop_reason() if stop else None
     }
 
 # ================= MULTI-TRIAL RUN =================
-runs = []
-for t in trange(TRIALS, desc="Rastrigin trials"):
-    runs.append(run_ga(seed=1000+t))
+def run_experiment():
+    from tqdm import trange
+
+    np.random.seed(34)
+    os.makedirs(OUTDIR, exist_ok=True)
+
+    runs = []
+    with HistoryRecorder(POSITIONS_FN, TRIALS, GENS, POP_SIZE) as rec:
+        for t in trange(TRIALS, desc="Rastrigin trials"):
+            runs.append(run_ga(seed=1000+t, record_positions=False, recorder=rec, trial=t))
+
+    # ================= SUMMARY =================
+    summary = {
+        "final_best_median": float(np.median([r["best"][-1] for r in runs])),
+        "final_distance_median": float(np.median([r["dist"][-1] for r in runs]))
+    }
+
+    with open(os.path.join(OUTDIR, "rastrigin_summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    ResultsStore(RUNS_DIR, mode="w").append(
+        seed=1000 + np.arange(TRIALS),
+        best=np.array([r["best"] for r in runs]),
+        mean=np.array([r["mean"] for r in runs]),
+        std=np.array([r["std"] for r in runs]),
+        dist=np.array([r["dist"] for r in runs]),
+        pop_size=POP_SIZE, gens=GENS, elitism=ELITISM, tournament_k=TOURNAMENT_K,
+        crossover_prob=CROSSOVER_PROB, mutation_pm=MUTATION_PM, mutation_sigma=MUTATION_SIGMA,
+    )
+
+    print("Rastrigin summary:", summary)
+    return summary
 
 # ================= AGGREGATE PLOTS =================
 def plot_with_iqr(data, ylabel, title, fname):
+    import matplotlib.pyplot as plt
+
     mat = np.array(data)
     median = np.median(mat, axis=0)
     q1 = np.percentile(mat, 25, axis=0)
@@ -130,26 +199,13 @@ def plot_with_iqr(data, ylabel, title, fname):
     plt.savefig(os.path.join(OUTDIR, fname))
     plt.show()
 
-plot_with_iqr([r["best"] for r in runs],
-              "Best fitness",
-              "Rastrigin: Best Fitness Over Time",
-              "rastrigin_best.png")
-
-plot_with_iqr([r["dist"] for r in runs],
-              "Distance to global optimum |x−0|",
-              "Rastrigin: Distance to Optimum",
-              "rastrigin_distance.png")
-
-plot_with_iqr([r["std"] for r in runs],
-              "Population diversity (std)",
-              "Rastrigin: Population Diversity",
-              "rastrigin_diversity.png")
-
 # ================= ANIMATION (ONE RUN) =================
-xs = np.linspace(DOMAIN[0], DOMAIN[1], 3000)
-fs = rastrigin_1d_dense(xs)
+def animate_run(positions, fname):
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
+    xs, fs = LANDSCAPE.grid(3000)
 
-def animate_run(run, fname):
     fig, ax = plt.subplots(figsize=(9,4))
     ax.plot(xs, fs, 'k', lw=1)
     ax.scatter([0], [rastrigin_1d_dense(0)], c='green', s=80, label='Global Optimum')
@@ -158,32 +214,46 @@ def animate_run(run, fname):
     ax.set_ylabel("Fitness")
     ax.legend()
 
-    scat = ax.scatter(run["positions"][0],
-                      rastrigin_1d_dense(np.array(run["positions"][0])),
+    scat = ax.scatter(positions[0],
+                      rastrigin_1d_dense(np.array(positions[0])),
                       c='red', s=40)
 
     def update(i):
-        pts = run["positions"][i]
+        pts = positions[i]
         scat.set_offsets(np.c_[pts, rastrigin_1d_dense(pts)])
         ax.set_title(f"Generation {i}")
         return scat,
 
-    anim = animation.FuncAnimation(fig, update, frames=GENS, interval=120)
+    anim = animation.FuncAnimation(fig, update, frames=len(positions), interval=120)
     anim.save(fname, writer="ffmpeg", dpi=150)
     plt.close(fig)
 
-anim_path = os.path.join(OUTDIR, "rastrigin_run0.mp4")
-animate_run(runs[0], anim_path)
+def render(animate=True):
+    """Post-processing: figures and video from the files run_experiment wrote."""
+    runs = ResultsStore(RUNS_DIR).load(["best", "dist", "std"])
+
+    plot_with_iqr(runs["best"],
+                  "Best fitness",
+                  "Rastrigin: Best Fitness Over Time",
+                  "rastrigin_best.png")
+
+    plot_with_iqr(runs["dist"],
+                  "Distance to global optimum |x−0|",
+                  "Rastrigin: Distance to Optimum",
+                  "rastrigin_distance.png")
 
-# ================= SUMMARY =================
-summary = {
-    "final_best_median": float(np.median([r["best"][-1] for r in runs])),
-    "final_distance_median": float(np.median([r["dist"][-1] for r in runs]))
-}
+    plot_with_iqr(runs["std"],
+                  "Population diversity (std)",
+                  "Rastrigin: Population Diversity",
+                  "rastrigin_diversity.png")
 
-with open(os.path.join(OUTDIR, "rastrigin_summary.json"), "w") as f:
-    json.dump(summary, f, indent=2)
+    if animate:
+        history, _ = load_history(POSITIONS_FN)
+        animate_run(history[0, :, :, 0], os.path.join(OUTDIR, "rastrigin_run0.mp4"))
+    print("Saved plots and animation to:", OUTDIR)
 
-print("Rastrigin summary:", summary)
-print("Saved plots and animation to:", OUTDIR)
+def main(argv=None):
+    experiment_main(run_experiment, render, argv, "1-D Rastrigin GA baseline")
 
+if __name__ == "__main__":
+    main()
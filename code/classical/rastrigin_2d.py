@@ -2,23 +2,21 @@
 import numpy as np
 import json
 import os
-import pickle
-import matplotlib.pyplot as plt
-from matplotlib import animation
 
-# ===================== RASTRIGIN 2D =====================
-A = 10.0
+from .cli import experiment_main
+from .landscapes import get_landscape, rastrigin
+from .rastrigin_nd import run_ga_rastrigin_nd
+from .recorder import HistoryRecorder, load_history
+from .results_store import ResultsStore
 
+# ===================== RASTRIGIN 2D =====================
 def rastrigin_2d(X):
     """
     X: (N, 2)
     returns: (N,)
     Global optimum at (0,0) with fitness = 2A
     """
-    x = X[:, 0]
-    y = X[:, 1]
-    return 2*A - ((x**2 - A*np.cos(2*np.pi*x)) +
-                  (y**2 - A*np.cos(2*np.pi*y)))
+    return rastrigin(X)
 
 # ===================== CLASSICAL GA =====================
 def run_ga_rastrigin_2d(
@@ -29,148 +27,156 @@ def run_ga_rastrigin_2d(
     mutation_prob=0.2,
     mutation_sigma=0.3,
     domain=(-5.12, 5.12),
-    seed=None
+    seed=None,
+    rng=None,
+    record_history=True,
+    recorder=None,
+    trial=0,
+    explorer=None,
+    checkpoint=None,
+    stop=None,
+    profiler=None,
+    dtype=np.float64
 ):
-    if seed is not None:
-        np.random.seed(seed)
-
-    pop = np.random.uniform(domain[0], domain[1], size=(pop_size, 2))
-
-    best_fitness = []
-    best_dist = []
-    diversity = []
-    pop_history = []
-
-    for g in range(gens):
-        fitness = rastrigin_2d(pop)
-        pop_history.append(pop.copy())
-
-        idx = np.argmax(fitness)
-        best_fitness.append(fitness[idx])
-        best_dist.append(np.linalg.norm(pop[idx]))
-        diversity.append(np.mean(np.std(pop, axis=0)))
-
-        elite_idx = np.argsort(fitness)[-elitism:]
-        elites = pop[elite_idx]
-        new_pop = [e.copy() for e in elites]
-
-        def tournament():
-            k = 3
-            idxs = np.random.choice(pop_size, k, replace=False)
-            return pop[idxs[np.argmax(fitness[idxs])]]
-
-        while len(new_pop) < pop_size:
-            p1, p2 = tournament(), tournament()
-
-            if np.random.rand() < crossover_prob:
-                alpha = np.random.rand()
-                child = alpha*p1 + (1-alpha)*p2
-            else:
-                child = p1.copy()
-
-            if np.random.rand() < mutation_prob:
-                child += np.random.normal(0, mutation_sigma, size=2)
-
-            child = np.clip(child, domain[0], domain[1])
-            new_pop.append(child)
-
-        pop = np.array(new_pop)
-
-    return {
-        "best_fitness": np.array(best_fitness),
-        "best_distance": np.array(best_dist),
-        "diversity": np.array(diversity),
-        "pop_history": pop_history
-    }
+    # the 2-D case of the vectorized D-dimensional GA
+    return run_ga_rastrigin_nd(
+        dim=2,
+        pop_size=pop_size,
+        gens=gens,
+        elitism=elitism,
+        crossover_prob=crossover_prob,
+        mutation_prob=mutation_prob,
+        mutation_sigma=mutation_sigma,
+        domain=domain,
+        seed=seed,
+        record_history=record_history,
+        rng=rng,
+        recorder=recorder,
+        trial=trial,
+        explorer=explorer,
+        checkpoint=checkpoint,
+        stop=stop,
+        profiler=profiler,
+        dtype=dtype,
+    )
 
 # ===================== RUN EXPERIMENTS =====================
 TRIALS = 30
-results = []
-
-for s in range(TRIALS):
-    results.append(run_ga_rastrigin_2d(seed=s))
+GENS = 150
+POP_SIZE = 40
+HISTORY_FN = "results/rastrigin_2d_pop_history.npy"
+RUNS_DIR = "results/rastrigin_2d_runs"
+
+def run_experiment():
+    os.makedirs("results", exist_ok=True)
+
+    # populations stream to HISTORY_FN; the runs themselves keep only metrics
+    results = []
+    with HistoryRecorder(HISTORY_FN, TRIALS, GENS, POP_SIZE, dim=2) as rec:
+        for s in range(TRIALS):
+            results.append(run_ga_rastrigin_2d(pop_size=POP_SIZE, gens=GENS, seed=s,
+                                               record_history=False, recorder=rec, trial=s))
+
+    final_distances = [r["best_distance"][-1] for r in results]
+
+    print("median final distance:", np.median(final_distances))
+    print("std final distance:", np.std(final_distances))
+
+    # ===================== SAVE RESULTS =====================
+    summary = {
+        "final_distances": final_distances,
+        "median_final_distance": float(np.median(final_distances)),
+        "std_final_distance": float(np.std(final_distances)),
+        "params": {
+            "pop_size": 40,
+            "gens": 150,
+            "elitism": 2,
+            "mutation_sigma": 0.3,
+            "mutation_prob": 0.2
+        }
+    }
 
-final_distances = [r["best_distance"][-1] for r in results]
+    with open("results/rastrigin_2d_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
 
-print("median final distance:", np.median(final_distances))
-print("std final distance:", np.std(final_distances))
+    # per-trial metric histories, one row per trial (see results_store.py);
+    # populations are already in HISTORY_FN
+    ResultsStore(RUNS_DIR, mode="w").append(
+        seed=np.arange(TRIALS),
+        best_fitness=np.array([r["best_fitness"] for r in results]),
+        best_distance=np.array([r["best_distance"] for r in results]),
+        diversity=np.array([r["diversity"] for r in results]),
+        **summary["params"],
+    )
+    return summary
 
 # ===================== PLOTS =====================
-plt.figure(figsize=(7,4))
-for r in results:
-    plt.plot(r["best_fitness"], alpha=0.5)
-plt.xlabel("Generation")
-plt.ylabel("Best fitness")
-plt.title("2D Rastrigin – Best Fitness vs Generation")
-plt.show()
-
-plt.figure(figsize=(7,4))
-for r in results:
-    plt.plot(r["best_distance"], alpha=0.5)
-plt.yscale("log")
-plt.xlabel("Generation")
-plt.ylabel("Distance to (0,0)")
-plt.title("2D Rastrigin – Distance to Global Optimum")
-plt.show()
-
-plt.figure(figsize=(7,4))
-for r in results:
-    plt.plot(r["diversity"], alpha=0.5)
-plt.xlabel("Generation")
-plt.ylabel("Population diversity")
-plt.title("2D Rastrigin – Diversity vs Generation")
-plt.show()
-
-# ===================== SAVE RESULTS =====================
-os.makedirs("results", exist_ok=True)
-
-summary = {
-    "final_distances": final_distances,
-    "median_final_distance": float(np.median(final_distances)),
-    "std_final_distance": float(np.std(final_distances)),
-    "params": {
-        "pop_size": 40,
-        "gens": 150,
-        "elitism": 2,
-        "mutation_sigma": 0.3,
-        "mutation_prob": 0.2
-    }
-}
+def plot_runs(results):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(7,4))
+    for r in results["best_fitness"]:
+        plt.plot(r, alpha=0.5)
+    plt.xlabel("Generation")
+    plt.ylabel("Best fitness")
+    plt.title("2D Rastrigin – Best Fitness vs Generation")
+    plt.show()
+
+    plt.figure(figsize=(7,4))
+    for r in results["best_distance"]:
+        plt.plot(r, alpha=0.5)
+    plt.yscale("log")
+    plt.xlabel("Generation")
+    plt.ylabel("Distance to (0,0)")
+    plt.title("2D Rastrigin – Distance to Global Optimum")
+    plt.show()
+
+    plt.figure(figsize=(7,4))
+    for r in results["diversity"]:
+        plt.plot(r, alpha=0.5)
+    plt.xlabel("Generation")
+    plt.ylabel("Population diversity")
+    plt.title("2D Rastrigin – Diversity vs Generation")
+    plt.show()
 
-with open("results/rastrigin_2d_summary.json", "w") as f:
-    json.dump(summary, f, indent=2)
+# ===================== ANIMATION =====================
+def animate_run(pop_hist, fname):
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
 
-with open("results/rastrigin_2d_full_runs.pkl", "wb") as f:
-    pickle.dump(results, f)
+    (X, Y), Z = get_landscape("rastrigin_2d").grid(300)
 
-# ===================== ANIMATION =====================
-x = np.linspace(-5.12, 5.12, 300)
-y = np.linspace(-5.12, 5.12, 300)
-X, Y = np.meshgrid(x, y)
-Z = 2*A - ((X**2 - A*np.cos(2*np.pi*X)) +
-           (Y**2 - A*np.cos(2*np.pi*Y)))
+    fig, ax = plt.subplots(figsize=(6,6))
+    ax.contourf(X, Y, Z, levels=50, cmap="viridis")
+    scat = ax.scatter([], [], c="red", s=20)
+
+    ax.set_xlim(-5.12, 5.12)
+    ax.set_ylim(-5.12, 5.12)
 
-run = results[0]
-pop_hist = run["pop_history"]
+    def update(frame):
+        scat.set_offsets(pop_hist[frame])
+        ax.set_title(f"Generation {frame}")
+        return scat,
 
-fig, ax = plt.subplots(figsize=(6,6))
-ax.contourf(X, Y, Z, levels=50, cmap="viridis")
-scat = ax.scatter([], [], c="red", s=20)
+    ani = animation.FuncAnimation(
+        fig,
+        update,
+        frames=len(pop_hist),
+        interval=150
+    )
 
-ax.set_xlim(-5.12, 5.12)
-ax.set_ylim(-5.12, 5.12)
+    ani.save(fname, writer="ffmpeg", dpi=150)
 
-def update(frame):
-    scat.set_offsets(pop_hist[frame])
-    ax.set_title(f"Generation {frame}")
-    return scat,
+def render(animate=True):
+    """Post-processing: figures and video from the files run_experiment wrote."""
+    plot_runs(ResultsStore(RUNS_DIR).load(["best_fitness", "best_distance", "diversity"]))
 
-ani = animation.FuncAnimation(
-    fig,
-    update,
-    frames=len(pop_hist),
-    interval=150
-)
+    if animate:
+        history, _ = load_history(HISTORY_FN)
+        animate_run(history[0], "results/rastrigin_2d_ga.mp4")
 
-ani.save("results/rastrigin_2d_ga.mp4", writer="ffmpeg", dpi=150)
+def main(argv=None):
+    experiment_main(run_experiment, render, argv, "Classical GA on 2-D Rastrigin")
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import numpy as np
+
+from .checkpoint import resume_run, save_if_due
+from .landscapes import rastrigin
+from .operators import blend_crossover, gaussian_mutate
+from .profiling import lap_timer
+from .selection import top_k, tournament_winners
+
+# ===================== CLASSICAL GA (D dimensions) =====================
+def run_ga_rastrigin_nd(
+    dim=2,
+    pop_size=40,
+    gens=150,
+    elitism=2,
+    tournament_k=3,
+    crossover_prob=0.8,
+    mutation_prob=0.2,
+    mutation_sigma=0.3,
+    domain=(-5.12, 5.12),
+    seed=None,
+    record_history=False,
+    rng=None,
+    recorder=None,
+    trial=0,
+    explorer=None,
+    checkpoint=None,
+    stop=None,
+    profiler=None,
+    dtype=np.float64,
+):
+    """
+    Generational GA of run_ga_rastrigin_2d for any dimension: elites are
+    kept, every other slot is filled by one child of two tournament
+    winners (blend with prob crossover_prob, else the first parent),
+    mutated as a whole vector with prob mutation_prob and clipped.
+
+    Offspring for a generation are produced as one (pop - elitism, dim)
+    matrix written into a reused buffer; nothing is built per child.
+    pop_history (gens, pop, dim) is only kept with record_history=True.
+    Fitness is carried with the population (elites are never
+    re-evaluated); "evaluations" counts the fitness calls made.
+    rng: a per-trial np.random.Generator (see runner.py); overrides seed.
+    recorder: a HistoryRecorder (recorder.py) that streams populations
+    to disk as row `trial` instead of keeping them in memory.
+    explorer: optional callable(pop, rng) run at the start of every
+    generation (e.g. quantum.exploration.NDExplorer); when it returns a
+    population, that replaces everything but the elites and is
+    re-evaluated. "explorations" counts how often that happened.
+    checkpoint: a Checkpoint (checkpoint.py); the run resumes from it
+    if one was saved and continues bit-identically.
+    stop: a StoppingRule (stopping.py) checked after each generation's
+    metrics; the returned histories end where it fired.
+    profiler: a Profiler (profiling.py) for per-phase timings and the
+    on_generation / on_collapse hooks.
+    dtype: float type of the population, fitness and histories; random
+    draws stay float64.
+    """
+    if rng is None:
+        if seed is not None:
+            np.random.seed(seed)
+        rng = np.random
+
+    N, E, D = pop_size, elitism, dim
+    n_children = N - E
+
+    pop = rng.uniform(domain[0], domain[1], size=(N, D)).astype(dtype, copy=False)
+    next_pop = np.empty_like(pop)
+    fitness = rastrigin(pop)
+    next_fitness = np.empty_like(fitness)
+    n_evals = N
+    n_explorations = 0
+    parents = np.empty((2 * n_children, D), dtype=dtype)
+
+    best_fitness = np.empty(gens, dtype=dtype)
+    best_dist = np.empty(gens, dtype=dtype)
+    diversity = np.empty(gens, dtype=dtype)
+    pop_history = np.empty((gens, N, D), dtype=dtype) if record_history else None
+
+    if stop is not None:
+        stop.start()
+    if profiler is not None:
+        profiler.begin()
+    lap = lap_timer(profiler)
+
+    n_gens = gens
+    start, saved = resume_run(checkpoint, rng, stop)
+    if saved is not None:
+        pop[:], fitness[:] = saved["pop"], saved["fitness"]
+        n_evals, n_explorations = int(saved["evaluations"]), int(saved["explorations"])
+        best_fitness[:start] = saved["best_fitness"]
+        best_dist[:start] = saved["best_distance"]
+        diversity[:start] = saved["diversity"]
+        if record_history:
+            pop_history[:start] = saved["pop_history"]
+
+    for g in range(start, gens):
+        if explorer is not None:
+            explored = explorer(pop, rng)
+            if explored is not None:
+                keep = top_k(fitness, E)
+                explored[:E] = pop[keep]
+                fitness[:E] = fitness[keep]
+                pop[:] = explored
+                fitness[E:] = rastrigin(pop[E:])
+                n_evals += n_children
+                n_explorations += 1
+            lap("exploration")
+
+        if record_history:
+            pop_history[g] = pop
+        if recorder is not None:
+            recorder.record(g, pop, trial)
+        lap("history")
+
+        idx = np.argmax(fitness)
+        best_fitness[g] = fitness[idx]
+        best_dist[g] = np.linalg.norm(pop[idx])
+        diversity[g] = np.mean(np.std(pop, axis=0))
+        lap("metrics")
+        if profiler is not None:
+            profiler.generation(g, trial=trial, pop=pop, scores=fitness, best=best_fitness[g],
+                                diversity=diversity[g], evaluations=n_evals)
+        if stop is not None:
+            done = stop.update(best_fitness[g], diversity[g], n_evals)
+            lap("stopping")
+            if done:
+                n_gens = g + 1
+                if recorder is not None:
+                    recorder.finish(g, pop, trial)
+                break
+
+        # ---- elitism ----
+        if E:
+            elite_idx = top_k(fitness, E)
+            next_pop[:E] = pop[elite_idx]
+            next_fitness[:E] = fitness[elite_idx]
+        lap("elitism")
+
+        # ---- offspring: rows (2i, 2i+1) of parents are child i's p1, p2 ----
+        winners = tournament_winners(fitness, tournament_k, n_select=2 * n_children,
+                                     replace=False, rng=rng)
+        np.take(pop, winners, axis=0, out=parents)
+        lap("selection")
+        children = next_pop[E:]
+        blend_crossover(parents, crossover_prob, rng, out=children, axis=-2, both=False)
+        lap("crossover")
+        gaussian_mutate(children, mutation_prob, mutation_sigma, domain, rng, axis=-2)
+        lap("mutation")
+        next_fitness[E:] = rastrigin(children)
+        n_evals += n_children
+        lap("evaluation")
+
+        pop, next_pop = next_pop, pop
+        fitness, next_fitness = next_fitness, fitness
+
+        if save_if_due(
+            checkpoint, g + 1, rng, stop, pop=pop, fitness=fitness, evaluations=n_evals,
+            explorations=n_explorations, best_fitness=best_fitness[:g + 1],
+            best_distance=best_dist[:g + 1], diversity=diversity[:g + 1],
+            pop_history=pop_history[:g + 1] if record_history else None,
+        ):
+            lap("checkpoint")
+
+    return {
+        "best_fitness": best_fitness[:n_gens],
+        "best_distance": best_dist[:n_gens],
+        "diversity": diversity[:n_gens],
+        "pop_history": pop_history[:n_gens] if record_history else None,
+        "evaluations": n_evals,
+        "explorations": n_explorations,
+        "generations": n_gens,
+        "stop_reason": stop.stop_reason() if stop else None,
+    }
@@ -0,0 +1,110 @@
+import json
+import os
+
+import numpy as np
+
+# ============================================================
+# STREAMING POPULATION HISTORY
+# ------------------------------------------------------------
+# Populations go straight into a preallocated .npy file of shape
+# (trials, frames, pop, dim) opened as a memmap, instead of a list of
+# pop.copy() per generation. `every` keeps one generation in `every`;
+# `sample` keeps a fixed random subset of individuals. Memory use is
+# one frame regardless of trials x gens. A small JSON sidecar
+# (<path>.json) records which generations and individuals were kept.
+# resume=True reopens an existing file of the same shape instead of
+# truncating it, for runs restarted from a Checkpoint (checkpoint.py).
+# A run ended early by a StoppingRule calls finish(), which repeats its
+# last population in the frames it never reached.
+# ============================================================
+
+class HistoryRecorder:
+
+    def __init__(self, path, trials, gens, pop_size, dim=1, every=1, sample=None,
+                 dtype=np.float64, seed=0, resume=False):
+        self.path = path
+        self.every = every
+        self.gens = np.arange(0, gens, every)
+
+        if sample is not None and sample < pop_size:
+            rng = np.random.default_rng(seed)
+            self.individuals = np.sort(rng.choice(pop_size, sample, replace=False))
+        else:
+            self.individuals = None
+        kept = pop_size if self.individuals is None else len(self.individuals)
+
+        self.pop_size, self.dim = pop_size, dim
+        shape = (trials, len(self.gens), kept, dim)
+        if resume and os.path.exists(path):
+            self.data = np.lib.format.open_memmap(path, mode="r+")
+            if self.data.shape != shape or self.data.dtype != dtype:
+                raise ValueError(f"{path} holds {self.data.shape} {self.data.dtype}, "
+                                 f"expected {shape} {np.dtype(dtype)}")
+        else:
+            self.data = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        with open(path + ".json", "w") as f:
+            json.dump({
+                "gens": self.gens.tolist(),
+                "individuals": None if self.individuals is None else self.individuals.tolist(),
+                "pop_size": pop_size,
+            }, f)
+
+    def record(self, gen, pop, trial=None):
+        """
+        Store generation `gen` if it falls on the stride.
+
+        pop: (N,) / (N, dim) for one trial (give `trial`), or
+        (trials, N) / (trials, N, dim) for a whole batch (trial=None),
+        or for the batch rows listed in an index array `trial`.
+        """
+        if gen % self.every:
+            return False
+        frame = gen // self.every
+        if trial is None or np.ndim(trial):
+            rows = slice(None) if trial is None else trial
+            pop = pop.reshape(-1, self.pop_size, self.dim)
+            self.data[rows, frame] = pop if self.individuals is None else pop[:, self.individuals]
+        else:
+            pop = pop.reshape(self.pop_size, self.dim)
+            self.data[trial, frame] = pop if self.individuals is None else pop[self.individuals]
+        return True
+
+    def finish(self, gen, pop, trial=None):
+        """
+        A run that stops after generation `gen` (pop: its population
+        then, shaped as for record()) holds that population in every
+        later frame, as the forward-filled in-memory histories do.
+        """
+        later = np.flatnonzero(self.gens > gen)
+        if len(later) == 0:
+            return
+        frames = slice(later[0], None)
+        if trial is None or np.ndim(trial):
+            rows = slice(None) if trial is None else trial
+            pop = pop.reshape(-1, 1, self.pop_size, self.dim)
+            self.data[rows, frames] = pop if self.individuals is None else pop[:, :, self.individuals]
+        else:
+            pop = pop.reshape(1, self.pop_size, self.dim)
+            self.data[trial, frames] = pop if self.individuals is None else pop[:, self.individuals]
+
+    def flush(self):
+        self.data.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def load_history(path):
+    """
+    Open a recorded history lazily.
+
+    Returns (history, meta): history is a read-only memmap of shape
+    (trials, frames, pop, dim); meta["gens"] gives the generation of each
+    frame and meta["individuals"] the kept indices (None = all).
+    """
+    with open(path + ".json") as f:
+        meta = json.load(f)
+    return np.load(path, mmap_mode="r"), meta
@@ -0,0 +1,75 @@
+import glob
+import os
+
+import numpy as np
+
+# ============================================================
+# COLUMNAR RESULTS STORE
+# ------------------------------------------------------------
+# A directory of compressed .npz chunks, one chunk per append. Every
+# chunk holds the same columns with one row per trial; a column can be
+# scalar per trial (seed, basin label, hyperparameters) or a per-
+# generation vector (best, mean, std, diversity, dist, ...).
+#
+# Members of an .npz are compressed and read independently, so loading
+# one column never decompresses the others. Nothing is pickled.
+# ============================================================
+
+class ResultsStore:
+
+    def __init__(self, path, mode="a"):
+        """mode="a" appends to existing chunks, mode="w" starts empty."""
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if mode == "w":
+            for fn in self._chunks():
+                os.remove(fn)
+        elif mode != "a":
+            raise ValueError(f"mode must be 'a' or 'w', got {mode!r}")
+
+    def _chunks(self):
+        return sorted(glob.glob(os.path.join(self.path, "chunk-*.npz")))
+
+    def append(self, **columns):
+        """
+        Append rows. Array columns share their first axis (rows); scalars
+        are repeated for every row, which suits hyperparameters.
+        """
+        arrays = {k: np.asarray(v) for k, v in columns.items()}
+        n = {a.shape[0] for a in arrays.values() if a.ndim}
+        if len(n) != 1:
+            raise ValueError(f"array columns must share their row count, got {sorted(n)}")
+        n = n.pop()
+        arrays = {k: (np.full(n, a) if a.ndim == 0 else a) for k, a in arrays.items()}
+
+        existing = self._chunks()
+        index = int(os.path.basename(existing[-1])[6:-4]) + 1 if existing else 0
+        np.savez_compressed(os.path.join(self.path, f"chunk-{index:06d}.npz"), **arrays)
+
+    def columns(self):
+        chunks = self._chunks()
+        if not chunks:
+            return []
+        with np.load(chunks[0], allow_pickle=False) as z:
+            return list(z.files)
+
+    def load(self, columns=None):
+        """Concatenate the requested columns (default: all) over every chunk."""
+        if columns is None:
+            columns = self.columns()
+        elif isinstance(columns, str):
+            columns = [columns]
+
+        parts = {c: [] for c in columns}
+        for fn in self._chunks():
+            with np.load(fn, allow_pickle=False) as z:
+                for c in columns:
+                    parts[c].append(z[c])
+        return {c: np.concatenate(p) if p else np.empty(0) for c, p in parts.items()}
+
+    def __len__(self):
+        total = 0
+        for fn in self._chunks():
+            with np.load(fn, allow_pickle=False) as z:
+                total += len(z[z.files[0]])
+        return total
@@ -0,0 +1,80 @@
+import numpy as np
+
+# ===================== PER-TRIAL RANDOM STREAMS =====================
+def spawn_generators(seed, n):
+    """
+    One independent np.random.Generator per trial, spawned from a single
+    SeedSequence. Trial t always receives child t of the tree.
+    """
+    children = np.random.SeedSequence(seed).spawn(n)
+    return [np.random.default_rng(s) for s in children]
+
+
+class TrialGenerators:
+    """
+    Batch of per-trial generators that fills (trials, ...) arrays.
+
+    Row t of every draw comes from generator t only, so the numbers a trial
+    sees do not depend on how many other trials share the batch.
+    """
+
+    def __init__(self, generators):
+        self.generators = list(generators)
+
+    @classmethod
+    def from_seed(cls, seed, n):
+        return cls(spawn_generators(seed, n))
+
+    def __len__(self):
+        return len(self.generators)
+
+    def _out(self, size, dtype, out):
+        if out is None:
+            out = np.empty(size, dtype=dtype)
+        if out.shape[0] != len(self.generators):
+            raise ValueError(
+                f"leading axis {out.shape[0]} does not match {len(self.generators)} trials"
+            )
+        return out
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        out = self._out(size, dtype, out)
+        for g, row in zip(self.generators, out):
+            g.random(dtype=out.dtype, out=row)
+        return out
+
+    def standard_normal(self, size=None, dtype=np.float64, out=None):
+        out = self._out(size, dtype, out)
+        for g, row in zip(self.generators, out):
+            g.standard_normal(dtype=out.dtype, out=row)
+        return out
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        out = self._out(size, np.float64, None)
+        for g, row in zip(self.generators, out):
+            row[...] = g.uniform(low, high, size=row.shape)
+        return out
+
+
+# ===================== DRAW HELPERS =====================
+# Operators accept rng=None (the global np.random state, so scripts that
+# call np.random.seed stay reproducible), a np.random.Generator, or
+# TrialGenerators. Callers that fill one random block per generation
+# pass slices of it as `u` / `noise` instead.
+
+def uniform_block(shape, rng=None, u=None):
+    """Uniforms in [0, 1) of the given shape, taken from u when supplied."""
+    if u is not None:
+        return u.reshape(shape)
+    if rng is None:
+        rng = np.random
+    return rng.random(shape)
+
+
+def normal_block(shape, rng=None, noise=None):
+    """Standard normals of the given shape, taken from noise when supplied."""
+    if noise is not None:
+        return noise.reshape(shape)
+    if rng is None:
+        rng = np.random
+    return rng.standard_normal(shape)
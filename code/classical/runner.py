@@ -0,0 +1,46 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+# ============================================================
+# PARALLEL TRIAL RUNNER
+# ------------------------------------------------------------
+# Trial t always gets np.random.default_rng(child t of
+# SeedSequence(seed)), the same tree rng.spawn_generators uses, so
+# results are bit-identical for any number of workers (including
+# workers=1, which runs in-process).
+#
+# run_fn must accept an `rng` keyword and be importable by the worker
+# processes (a module-level function or a functools.partial of one),
+# e.g. run_single (twin_peaks.py), run_ga (rastrigin_1d.py),
+# run_single_ga (parabola.py) or run_ga_rastrigin_2d.
+# ============================================================
+
+def _run_one(run_fn, seed_seq, kwargs):
+    return run_fn(rng=np.random.default_rng(seed_seq), **kwargs)
+
+
+def run_trials(run_fn, trials, seed=None, workers=None, chunksize=None, **kwargs):
+    """
+    Run run_fn(rng=..., **kwargs) once per trial and return the results
+    in trial order.
+
+    workers: process count (default os.cpu_count()); 1 runs serially.
+    chunksize: trials per task sent to a worker (default spreads the
+    trials over roughly four tasks per worker).
+    """
+    seeds = np.random.SeedSequence(seed).spawn(trials)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, trials) if trials else 1
+
+    if workers <= 1:
+        return [_run_one(run_fn, s, kwargs) for s in seeds]
+
+    if chunksize is None:
+        chunksize = max(1, trials // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_run_one, repeat(run_fn), seeds, repeat(kwargs),
+                           chunksize=chunksize))
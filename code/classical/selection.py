@@ -0,0 +1,121 @@
+import numpy as np
+
+from .rng import uniform_block
+
+# ============================================================
+# VECTORIZED TOURNAMENT SELECTION
+# ------------------------------------------------------------
+# Every tournament of a generation is drawn at once as an
+# (..., n_select, k) index matrix and resolved with one argmax.
+# Leading axes are batch axes (e.g. trials), so the same call
+# serves a single population (N,) and a batch (trials, N).
+#
+# Survivor selection (elites, truncation to the best children) uses
+# top_k: one argpartition, O(N) instead of a full O(N log N) argsort.
+#
+# rng / u follow the conventions in rng.py (default: global np.random).
+# ============================================================
+
+def tournament_indices(n, k, n_select=None, replace=True, batch=(), rng=None, u=None):
+    """
+    Candidate matrix of shape (*batch, n_select, k) with entries in [0, n).
+
+    replace=False gives k distinct candidates per tournament (Floyd's
+    subset sampling, vectorized over all tournaments; needs k <= n).
+    u: optional pre-drawn uniforms with (*batch, n_select * k) elements,
+    for callers that fill one random block per generation.
+    """
+    if n_select is None:
+        n_select = n
+    shape = tuple(batch) + (n_select, k)
+    u = uniform_block(shape, rng, u)
+
+    if replace:
+        idx = (u * n).astype(np.intp)
+        return np.minimum(idx, n - 1, out=idx)
+
+    if k > n:
+        raise ValueError(f"cannot draw {k} distinct candidates from {n}")
+    idx = np.empty(shape, dtype=np.intp)
+    for i, j in enumerate(range(n - k, n)):
+        t = np.minimum((u[..., i] * (j + 1)).astype(np.intp), j)
+        seen = (idx[..., :i] == t[..., None]).any(axis=-1)
+        idx[..., i] = np.where(seen, j, t)
+    return idx
+
+
+def tournament_winners(scores, k, n_select=None, replace=True, rng=None, u=None):
+    """
+    Winner indices of n_select size-k tournaments on scores (..., N).
+
+    Returns (..., n_select) indices into the last axis of scores; gather
+    genomes with np.take_along_axis (or pop[winners] for a single 1-D pop).
+    NaN scores lose to every number.
+    """
+    scores = np.asarray(scores)
+    batch, n = scores.shape[:-1], scores.shape[-1]
+    idx = tournament_indices(n, k, n_select, replace, batch, rng, u)
+
+    flat = idx.reshape(batch + (-1,))
+    cand = np.take_along_axis(scores, flat, axis=-1).reshape(idx.shape)
+    if cand.dtype.kind == "f" and np.isnan(cand).any():
+        # as in top_k: NaN loses to every number
+        cand = np.where(np.isnan(cand), -np.inf, cand)
+    best = cand.argmax(axis=-1)[..., None]
+    return np.take_along_axis(idx, best, axis=-1)[..., 0]
+
+
+def top_k(scores, n, order="score"):
+    """
+    Indices of the n highest scores along the last axis (..., N) -> (..., n).
+
+    Which indices: everything scoring above the n-th largest score, then
+    as many of the scores tied with it as still fit, lowest index first.
+    This is not np.argsort(scores)[..., -n:], which keeps the highest
+    tied indices: [1, 2, 2, 2, 0] with n=2 gives [1, 2] here, [2, 3]
+    there. The choice does not depend on argpartition's tie order.
+
+    In what order: order="score": ascending score, equal scores by
+    index; the extra sort is over the n picked only. order="position":
+    ascending index, i.e. survivors stay in population order; O(N)
+    overall. order=None: argpartition's order and tie choice (not the
+    rule above).
+
+    NaN scores rank below every number. The partition pays off on large
+    populations only: at the scripts' N=30 a plain argsort is several
+    times faster (a few us against a few tens of us per call).
+    """
+    scores = np.asarray(scores)
+    if scores.dtype.kind == "f" and np.isnan(scores).any():
+        # a failed evaluation (NaN) ranks below every number
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+    N = scores.shape[-1]
+    n = min(n, N)
+    if n <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+
+    if n == N:
+        if order == "score":
+            return np.argsort(scores, axis=-1, kind="stable")
+        return np.array(np.broadcast_to(np.arange(N), scores.shape))
+    part = np.argpartition(scores, N - n, axis=-1)
+    if order is None:
+        return part[..., N - n:]
+
+    # everything above the n-th largest score, then as many of its ties
+    # as still fit, leftmost first; no sort
+    kth = np.take_along_axis(scores, part[..., N - n:N - n + 1], axis=-1)
+    keep = scores >= kth
+    excess = np.count_nonzero(keep, axis=-1) > n
+    if excess.any():
+        # rows with more ties than room: drop the rightmost ones
+        s, k = scores[excess], kth[excess]
+        ties = s == k
+        need = n - np.count_nonzero(s > k, axis=-1)[..., None]
+        keep[excess] = (s > k) | (ties & (np.cumsum(ties, axis=-1) <= need))
+    rows = np.arange(0, scores.size, N).reshape(scores.shape[:-1] + (1,))
+    idx = np.flatnonzero(keep).reshape(scores.shape[:-1] + (n,)) - rows
+    if order == "score":
+        picked = np.take_along_axis(scores, idx, axis=-1)
+        idx = np.take_along_axis(idx, np.argsort(picked, axis=-1, kind="stable"), axis=-1)
+    return idx
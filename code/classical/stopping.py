@@ -0,0 +1,88 @@
+import time
+
+import numpy as np
+
+# ============================================================
+# EARLY TERMINATION
+# ------------------------------------------------------------
+# A StoppingRule combines any of
+#   target        best fitness >= target
+#   min_diversity population spread (position std) < min_diversity
+#   patience      no best-fitness improvement (> tol) for K generations
+#   max_evals     fitness evaluations >= max_evals
+#   max_seconds   wall-clock time since start() >= max_seconds
+# and is asked once per generation, after that generation's metrics
+# are recorded. The first criterion that holds is kept as the reason.
+#
+# The same rule serves one run (scalar metrics) and a batch of trials
+# ((trials,) metrics; `rows` selects the trials still running), so the
+# batched engine can drop finished trials from its working set.
+# Run loops take it as stop=None; histories end at the generation where
+# it fires, and its state travels in checkpoints (see checkpoint.py).
+# ============================================================
+
+REASONS = ("target", "diversity", "stagnation", "evaluations", "time")
+
+
+class StoppingRule:
+
+    def __init__(self, target=None, min_diversity=None, patience=None,
+                 max_evals=None, max_seconds=None, tol=0.0):
+        self.target = target
+        self.min_diversity = min_diversity
+        self.patience = patience
+        self.max_evals = max_evals
+        self.max_seconds = max_seconds
+        self.tol = tol
+        self.start()
+
+    def start(self, shape=()):
+        """Reset the per-run state for a run (shape=()) or a batch (shape=(trials,))."""
+        self.best = np.full(shape, -np.inf)
+        self.stall = np.zeros(shape, dtype=int)
+        self.reason = np.full(shape, "", dtype="<U12")
+        self._t0 = time.perf_counter()
+
+    def update(self, best, diversity, evals, rows=None):
+        """
+        Feed one generation's metrics; returns whether each run should
+        stop now (a bool, or a bool array for a batch). rows: indices of
+        the batch trials the metrics belong to (default: all).
+        """
+        sel = Ellipsis if rows is None else rows
+        best = np.asarray(best, dtype=float)
+
+        improved = best > self.best[sel] + self.tol
+        self.stall[sel] = np.where(improved, 0, self.stall[sel] + 1)
+        self.best[sel] = np.maximum(self.best[sel], best)
+
+        hits = [
+            None if self.target is None else best >= self.target,
+            None if self.min_diversity is None else np.asarray(diversity) < self.min_diversity,
+            None if self.patience is None else self.stall[sel] >= self.patience,
+            None if self.max_evals is None else np.asarray(evals) >= self.max_evals,
+            None if self.max_seconds is None
+            else np.full(best.shape, time.perf_counter() - self._t0 >= self.max_seconds),
+        ]
+        reason = np.full(best.shape, "", dtype="<U12")
+        for label, hit in zip(REASONS, hits):
+            if hit is not None:
+                reason = np.where((reason == "") & hit, label, reason)
+        self.reason[sel] = reason
+        done = reason != ""
+        return bool(done) if done.ndim == 0 else done
+
+    # ---- checkpoint support (checkpoint.py) ----
+    def state(self):
+        return {"stop_best": self.best, "stop_stall": self.stall, "stop_reason": self.reason,
+                "stop_elapsed": time.perf_counter() - self._t0}
+
+    def set_state(self, saved):
+        self.best = saved["stop_best"].copy()
+        self.stall = saved["stop_stall"].copy()
+        self.reason = saved["stop_reason"].copy()
+        self._t0 = time.perf_counter() - float(saved["stop_elapsed"])
+
+    def stop_reason(self):
+        """Reason per run ("" while running); a str for a single run."""
+        return str(self.reason) if self.reason.ndim == 0 else self.reason
@@ -0,0 +1,220 @@
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import run_batched_ga
+from .landscapes import LANDSCAPES, Landscape, get_landscape
+
+# ============================================================
+# PARAMETER SWEEPS WITH A RESULT CACHE
+# ------------------------------------------------------------
+# expand_grid() turns axes of candidate values into a list of configs
+# (plain keyword dicts). run_sweep() calls run_fn(**config) for each of
+# them in worker processes and stores every result as
+#
+#   <cache_dir>/<key>.npz    result arrays (compressed, no pickle)
+#   <cache_dir>/<key>.json   the config and the function that made it
+#
+# where key hashes the function name and the full config (landscape,
+# operator parameters, seed, ...) with every default filled in, down to
+# those of the engine a run function forwards to (run_fn.forwards).
+# Re-running a sweep loads cached keys and only computes configurations
+# that are new or changed, including changed defaults.
+#
+# From the code/ directory:
+#   python -m classical.sweep     # example sweep over the deceptive landscape
+# ============================================================
+
+def expand_grid(base=None, **axes):
+    """
+    Cartesian product of the axes on top of base, in a stable order:
+
+        expand_grid({"gens": 80}, pop_size=[30, 60], seed=range(3))
+        -> 6 configs, seed varying fastest
+    """
+    base = dict(base or {})
+    names = list(axes)
+    return [dict(base, **dict(zip(names, values)))
+            for values in itertools.product(*(list(axes[n]) for n in names))]
+
+
+def _qualname(obj):
+    module = obj.__module__
+    if module == "__main__":
+        # same key whether run as a script (-m) or imported
+        spec = getattr(sys.modules["__main__"], "__spec__", None)
+        module = spec.name if spec else module
+    return f"{module}.{obj.__qualname__}"
+
+
+def _plain(value):
+    """
+    JSON form of a config value: numbers, strings, numpy scalars/arrays
+    and dtypes, containers, functions and classes (by qualified name),
+    registered landscapes (by name), and other objects as their type
+    plus their settings: the constructor arguments kept as attributes
+    of the same name, else the public vars(). TypeError otherwise.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.dtype):
+        return str(value)
+    if isinstance(value, (np.ndarray, tuple, list)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        return _qualname(value)
+    if isinstance(value, Landscape) and LANDSCAPES.get(value.name) is value:
+        return {"landscape": value.name}
+    if hasattr(value, "__dict__"):
+        cls = type(value)
+        try:
+            names = [n for n in inspect.signature(cls).parameters if n != "self"]
+        except (TypeError, ValueError):
+            names = []
+        if names and all(hasattr(value, n) for n in names):
+            # configuration only, not state the object builds up while used
+            settings = {n: getattr(value, n) for n in names}
+        else:
+            settings = {k: v for k, v in vars(value).items() if not k.startswith("_")}
+        return {"type": _qualname(cls), "settings": _plain(settings)}
+    raise TypeError(f"cannot encode {type(value).__name__} value {value!r} "
+                    f"in a sweep config")
+
+
+def resolved_config(run_fn, config):
+    """
+    config with every default run_fn would use filled in. Keyword
+    arguments collected by **params count as passed on to
+    run_fn.forwards (if set), whose defaults are filled in as well.
+    """
+    sig = inspect.signature(run_fn)
+    bound = sig.bind(**config)
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+    for name, p in sig.parameters.items():
+        if p.kind is not p.VAR_KEYWORD:
+            continue
+        extra = params.pop(name, {})
+        target = getattr(run_fn, "forwards", None)
+        if target is not None:
+            for n, q in inspect.signature(target).parameters.items():
+                if q.default is not q.empty and n not in params:
+                    extra.setdefault(n, q.default)
+        params.update(extra)
+    return params
+
+
+def config_key(run_fn, config):
+    """Hex digest identifying run_fn applied to config, defaults included."""
+    blob = json.dumps({"fn": _plain(run_fn), "config": _plain(resolved_config(run_fn, config))},
+                      sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def _save(path, run_fn, config, result):
+    # the .npz marks a cached key, so it is moved into place last and
+    # whole: a crash mid-write leaves no truncated result behind
+    with open(path + ".tmp.json", "w") as f:
+        json.dump({"fn": _plain(run_fn), "config": _plain(config),
+                   "resolved": _plain(resolved_config(run_fn, config))}, f, indent=2)
+    os.replace(path + ".tmp.json", path + ".json")
+    arrays = {k: np.asarray(v) for k, v in result.items() if v is not None}
+    np.savez_compressed(path + ".tmp.npz", **arrays)
+    os.replace(path + ".tmp.npz", path + ".npz")
+
+
+def _load(path):
+    with np.load(path + ".npz", allow_pickle=False) as z:
+        return {k: z[k] for k in z.files}
+
+
+def _call(run_fn, config):
+    return run_fn(**config)
+
+
+def run_sweep(run_fn, configs, cache_dir, workers=None, recompute=False):
+    """
+    Run run_fn(**config) for every config, reusing cached results.
+
+    run_fn must be importable by worker processes and return a dict of
+    arrays/scalars (None entries are dropped). Returns [(config, result)]
+    in the order of configs; cached and fresh results look the same.
+    workers: process count (default os.cpu_count()); 1 runs in-process.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = [os.path.join(cache_dir, config_key(run_fn, c)) for c in configs]
+    todo = [i for i, p in enumerate(paths)
+            if recompute or not os.path.exists(p + ".npz")]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(todo)))
+    if workers == 1:
+        fresh = (_call(run_fn, configs[i]) for i in todo)
+        for i, result in zip(todo, fresh):
+            _save(paths[i], run_fn, configs[i], result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_call, run_fn, configs[i]) for i in todo]
+            for i, fut in zip(todo, futures):
+                _save(paths[i], run_fn, configs[i], fut.result())
+
+    return [(c, _load(p)) for c, p in zip(configs, paths)]
+
+
+# ===================== READY-MADE RUN FUNCTIONS =====================
+def landscape_ga(landscape, seed, trials=30, **params):
+    """
+    Batched GA (engine.run_batched_ga) on a registered 1-D landscape,
+    reduced to per-generation medians so a sweep cell stays small.
+    """
+    land = get_landscape(landscape)
+    out = run_batched_ga(land, land.domain, trials, seed=seed,
+                         optimum=land.optimum, **params)
+    summary = {
+        "best_median": np.median(out["best"], axis=0),
+        "std_median": np.median(out["std"], axis=0),
+        "evaluations": out["evaluations"],
+    }
+    if land.basins:
+        best_x = out["final_pop"][np.arange(trials), out["final_scores"].argmax(axis=1)]
+        labels = land.classify(best_x)
+        for label in land.basins:
+            summary[f"frac_{label}"] = np.mean(labels == label)
+    if "dist" in out:
+        summary["dist_median"] = np.median(out["dist"], axis=0)
+    return summary
+
+
+landscape_ga.forwards = run_batched_ga  # **params are engine arguments
+
+
+def main(cache_dir="results/sweeps/deceptive"):
+    configs = expand_grid(
+        {"landscape": "deceptive", "gens": 80},
+        pop_size=[30, 60],
+        mutation_sigma=[0.5, 1.0, 2.0],
+        tournament_k=[3, 5],
+        seed=[0],
+    )
+    results = run_sweep(landscape_ga, configs, cache_dir)
+    print(f"{'pop':>4} {'sigma':>5} {'k':>2} | {'global':>6} {'local':>6} {'best':>7}")
+    for config, r in results:
+        print(f"{config['pop_size']:4d} {config['mutation_sigma']:5.1f} "
+              f"{config['tournament_k']:2d} | {float(r['frac_global']):6.2f} "
+              f"{float(r['frac_local']):6.2f} {r['best_median'][-1]:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
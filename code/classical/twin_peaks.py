@@ -2,11 +2,17 @@
 # classical_deceptive_research_with_anim.py
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import animation
-from tqdm import trange
 import os, json
 
+from .checkpoint import resume_run, save_if_due
+from .cli import experiment_main
+from .landscapes import get_landscape
+from .operators import blend_crossover as blend_pairs, gaussian_mutate
+from .profiling import lap_timer
+from .recorder import HistoryRecorder, load_history
+from .results_store import ResultsStore
+from .selection import top_k, tournament_winners
+
 # ============================================================
 # 1. FROZEN PARAMETERS (DO NOT TUNE)
 # ============================================================
@@ -19,73 +25,109 @@ MUT_SIGMA = 0.15
 DOMAIN = (-8, 8)
 TRIALS = 40
 
-np.random.seed(42)
-
 OUTDIR = "classical_deceptive_results"
-os.makedirs(OUTDIR, exist_ok=True)
+POP_HIST_FN = os.path.join(OUTDIR, "pop_history.npy")
+RUNS_DIR = os.path.join(OUTDIR, "runs")
 
 # ============================================================
 # 2. STRONGLY DECEPTIVE LANDSCAPE (FINAL)
 # ============================================================
-def fitness(x):
-    return (
-        8 * np.exp(-(x + 4)**2 / 1.5)    # wide local trap
-        + 10 * np.exp(-(x - 2)**2 / 0.2) # narrow global optimum
-    )
+# 8*exp(-(x+4)^2/1.5) (wide local trap) + 10*exp(-(x-2)^2/0.2) (narrow
+# global optimum); defined once in landscapes.py as "deceptive"
+fitness = get_landscape("deceptive")
 
 # ============================================================
 # 3. GA PRIMITIVES
 # ============================================================
-def init_pop():
-    return np.random.uniform(DOMAIN[0], DOMAIN[1], POP)
+def init_pop(rng=None):
+    if rng is None:
+        rng = np.random
+    return rng.uniform(DOMAIN[0], DOMAIN[1], POP)
 
-def tournament_select(pop, scores):
-    parents = []
-    for _ in range(POP):
-        idx = np.random.randint(0, POP, TOURNAMENT_K)
-        parents.append(pop[idx[np.argmax(scores[idx])]])
-    return np.array(parents)
+def tournament_select(pop, scores, rng=None):
+    return pop[tournament_winners(scores, TOURNAMENT_K, rng=rng)]
 
-def blend_crossover(parents):
-    children = parents.copy()
-    for i in range(0, POP-1, 2):
-        a, b = parents[i], parents[i+1]
-        alpha = np.random.rand()
-        children[i]   = alpha*a + (1-alpha)*b
-        children[i+1] = (1-alpha)*a + alpha*b
-    return children
+def blend_crossover(parents, rng=None):
+    return blend_pairs(parents, 1.0, rng)
 
-def mutate(children):
-    mask = np.random.rand(POP) < MUT_P
-    children[mask] += np.random.normal(0, MUT_SIGMA, mask.sum())
-    return np.clip(children, DOMAIN[0], DOMAIN[1])
+def mutate(children, rng=None):
+    return gaussian_mutate(children, MUT_P, MUT_SIGMA, DOMAIN, rng)
 
 # ============================================================
 # 4. SINGLE RUN (RECORD EVERYTHING, INCLUDING POPS)
 # ============================================================
-def run_single(seed):
-    np.random.seed(seed)
-    pop = init_pop()
+def run_single(seed=None, rng=None, recorder=None, trial=0, checkpoint=None, stop=None,
+               profiler=None):
+    # rng: a per-trial np.random.Generator (see runner.py); overrides seed
+    # recorder: a HistoryRecorder (recorder.py); populations stream to disk
+    # as row `trial` instead of being kept in pop_hist
+    # checkpoint / stop / profiler: the run-loop protocol in checkpoint.py
+    if rng is None:
+        np.random.seed(seed)
+    pop = init_pop(rng)
 
     best_hist = []
     std_hist = []
-    pop_hist = []          # <- NEW: store population each generation
+    pop_hist = [] if recorder is None else None
+
+    scores = fitness(pop)
+    n_evals = POP
+
+    if stop is not None:
+        stop.start()
+    if profiler is not None:
+        profiler.begin()
+    lap = lap_timer(profiler)
 
-    for g in range(GENS):
-        scores = fitness(pop)
+    start, saved = resume_run(checkpoint, rng, stop)
+    if saved is not None:
+        pop, scores, n_evals = saved["pop"], saved["scores"], int(saved["evaluations"])
+        best_hist, std_hist = list(saved["best"]), list(saved["std"])
+        if recorder is None:
+            pop_hist = list(saved["pop_hist"])
+
+    for g in range(start, GENS):
         best_hist.append(scores.max())
         std_hist.append(pop.std())
-        pop_hist.append(pop.copy())
-
-        elites = pop[np.argsort(scores)[-ELITISM:]]
-        parents = tournament_select(pop, scores)
-        children = blend_crossover(parents)
-        children = mutate(children)
+        lap("metrics")
+        if recorder is None:
+            pop_hist.append(pop.copy())
+        else:
+            recorder.record(g, pop, trial)
+        lap("history")
+        if profiler is not None:
+            profiler.generation(g, trial=trial, pop=pop, scores=scores, best=best_hist[-1],
+                                diversity=std_hist[-1], evaluations=n_evals)
+        if stop is not None:
+            done = stop.update(best_hist[-1], std_hist[-1], n_evals)
+            lap("stopping")
+            if done:
+                if recorder is not None:
+                    recorder.finish(g, pop, trial)
+                break
+
+        elite_idx = top_k(scores, ELITISM)
+        elites = pop[elite_idx]
+        lap("elitism")
+        parents = tournament_select(pop, scores, rng)
+        lap("selection")
+        children = blend_crossover(parents, rng)
+        lap("crossover")
+        children = mutate(children, rng)
+        lap("mutation")
 
         child_scores = fitness(children)
-        best_children = children[np.argsort(child_scores)[-(POP-ELITISM):]]
+        n_evals += POP
+        lap("evaluation")
+        best_idx = top_k(child_scores, POP - ELITISM, order="position")
+
+        pop = np.concatenate([elites, children[best_idx]])
+        scores = np.concatenate([scores[elite_idx], child_scores[best_idx]])
+        lap("replacement")
 
-        pop = np.concatenate([elites, best_children])
+        if save_if_due(checkpoint, g + 1, rng, stop, pop=pop, scores=scores,
+                       evaluations=n_evals, best=best_hist, std=std_hist, pop_hist=pop_hist):
+            lap("checkpoint")
 
     final_pop = pop.copy()
     return {
@@ -93,124 +135,156 @@ def run_single(seed):
         "best_hist": best_hist,
         "std_hist": std_hist,
         "final_pop": final_pop,
-        "pop_hist": pop_hist      # <- NEW
+        "final_scores": scores,
+        "pop_hist": pop_hist,
+        "evaluations": n_evals,
+        "generations": len(best_hist),
+        "stop_reason": stop.stop_reason() if stop else None
     }
 
 # ============================================================
 # 5. PEAK DETECTION (ROBUST)
 # ============================================================
-xs_dense = np.linspace(DOMAIN[0], DOMAIN[1], 5000)
-fs_dense = fitness(xs_dense)
+# peaks are located on the landscape's cached 5000-point grid
+xs_dense, fs_dense = fitness.grid(5000)
 
-global_x = xs_dense[np.argmax(fs_dense)]
-mask = np.abs(xs_dense - global_x) > 1.0
-local_x = xs_dense[mask][np.argmax(fs_dense[mask])]
+global_x = fitness.optimum
+local_x = fitness.local_optimum
 
 def classify_run(final_pop):
     best_x = final_pop[np.argmax(fitness(final_pop))]
-    if abs(best_x - global_x) < 0.5:
-        return "global"
-    elif abs(best_x - local_x) < 0.5:
-        return "local"
-    else:
-        return "other"
+    return fitness.classify(best_x)
 
 # ============================================================
 # 6. RUN EXPERIMENTS
 # ============================================================
-runs = []
-stats = {"global": 0, "local": 0, "other": 0}
-
-for t in trange(TRIALS, desc="Running deceptive GA trials"):
-    res = run_single(seed=1000 + t)
-    label = classify_run(res["final_pop"])
-    stats[label] += 1
-    runs.append(res)
-
-# ============================================================
-# 7. SAVE SUMMARY
-# ============================================================
-summary = {
-    "params": {
-        "POP": POP,
-        "GENS": GENS,
-        "ELITISM": ELITISM,
-        "TOURNAMENT_K": TOURNAMENT_K,
-        "MUT_P": MUT_P,
-        "MUT_SIGMA": MUT_SIGMA
-    },
-    "results": stats,
-    "trials": TRIALS,
-    "global_peak_x": float(global_x),
-    "local_peak_x": float(local_x)
-}
+def run_experiment():
+    from tqdm import trange
+
+    np.random.seed(42)
+    os.makedirs(OUTDIR, exist_ok=True)
+
+    runs = []
+    labels = []
+    stats = {"global": 0, "local": 0, "other": 0}
+
+    with HistoryRecorder(POP_HIST_FN, TRIALS, GENS, POP) as rec:
+        for t in trange(TRIALS, desc="Running deceptive GA trials"):
+            res = run_single(seed=1000 + t, recorder=rec, trial=t)
+            label = classify_run(res["final_pop"])
+            stats[label] += 1
+            labels.append(label)
+            runs.append(res)
+
+    # ========================================================
+    # 7. SAVE SUMMARY
+    # ========================================================
+    summary = {
+        "params": {
+            "POP": POP,
+            "GENS": GENS,
+            "ELITISM": ELITISM,
+            "TOURNAMENT_K": TOURNAMENT_K,
+            "MUT_P": MUT_P,
+            "MUT_SIGMA": MUT_SIGMA
+        },
+        "results": stats,
+        "trials": TRIALS,
+        "global_peak_x": float(global_x),
+        "local_peak_x": float(local_x)
+    }
 
-with open(os.path.join(OUTDIR, "summary.json"), "w") as f:
-    json.dump(summary, f, indent=2)
+    with open(os.path.join(OUTDIR, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    # per-trial metrics, one row per trial (see results_store.py)
+    ResultsStore(RUNS_DIR, mode="w").append(
+        seed=1000 + np.arange(TRIALS),
+        best=np.array([r["best_hist"] for r in runs]),
+        std=np.array([r["std_hist"] for r in runs]),
+        basin=np.array(labels),
+        POP=POP, GENS=GENS, ELITISM=ELITISM, TOURNAMENT_K=TOURNAMENT_K,
+        MUT_P=MUT_P, MUT_SIGMA=MUT_SIGMA,
+    )
 
-print("\nSUMMARY:", summary)
+    print("\nSUMMARY:", summary)
+    return summary
 
 # ============================================================
 # 8. AGGREGATE PLOTS (SANITY CHECK)
 # ============================================================
-best_matrix = np.array([r["best_hist"] for r in runs])
-median = np.median(best_matrix, axis=0)
-q1 = np.percentile(best_matrix, 25, axis=0)
-q3 = np.percentile(best_matrix, 75, axis=0)
-
-plt.figure(figsize=(7,4))
-plt.fill_between(range(GENS), q1, q3, alpha=0.3, label="IQR")
-plt.plot(median, label="Median best fitness")
-plt.xlabel("Generation")
-plt.ylabel("Best fitness")
-plt.title("Classical GA on Deceptive Landscape")
-plt.legend()
-plt.grid(True)
-plt.savefig(os.path.join(OUTDIR, "aggregate_best_fitness.png"))
-plt.show()
+def plot_aggregate(best_matrix):
+    import matplotlib.pyplot as plt
+
+    median = np.median(best_matrix, axis=0)
+    q1 = np.percentile(best_matrix, 25, axis=0)
+    q3 = np.percentile(best_matrix, 75, axis=0)
+
+    plt.figure(figsize=(7,4))
+    plt.fill_between(range(best_matrix.shape[1]), q1, q3, alpha=0.3, label="IQR")
+    plt.plot(median, label="Median best fitness")
+    plt.xlabel("Generation")
+    plt.ylabel("Best fitness")
+    plt.title("Classical GA on Deceptive Landscape")
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(os.path.join(OUTDIR, "aggregate_best_fitness.png"))
+    plt.show()
 
 # ============================================================
 # 9. ANIMATION OF POPULATION EVOLUTION
 # ============================================================
-# choose one run to animate (e.g. first)
-run_to_anim = runs[0]
-pop_hist = run_to_anim["pop_hist"]
-
-fig, ax = plt.subplots(figsize=(7,4))
-ax.plot(xs_dense, fs_dense, 'k-', lw=1)       # fitness landscape
-ax.set_xlim(DOMAIN)
-ax.set_ylim(0, fs_dense.max() * 1.1)
-ax.set_xlabel("x")
-ax.set_ylabel("fitness")
-ax.set_title("GA population over generations")
-
-# initial scatter: positions vs fitness(x)
-scat = ax.scatter(pop_hist[0], fitness(np.array(pop_hist[0])),
-                  c='tab:blue', s=30, alpha=0.7)
-
-gen_text = ax.text(0.02, 0.95, "", transform=ax.transAxes)
-
-def init():
-    scat.set_offsets(np.c_[pop_hist[0], fitness(np.array(pop_hist[0]))])
-    gen_text.set_text("Generation 0")
-    return scat, gen_text
+def animate_run(pop_hist, mp4_path):
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
+    fig, ax = plt.subplots(figsize=(7,4))
+    ax.plot(xs_dense, fs_dense, 'k-', lw=1)       # fitness landscape
+    ax.set_xlim(DOMAIN)
+    ax.set_ylim(0, fs_dense.max() * 1.1)
+    ax.set_xlabel("x")
+    ax.set_ylabel("fitness")
+    ax.set_title("GA population over generations")
+
+    # initial scatter: positions vs fitness(x)
+    scat = ax.scatter(pop_hist[0], fitness(np.array(pop_hist[0])),
+                      c='tab:blue', s=30, alpha=0.7)
+
+    gen_text = ax.text(0.02, 0.95, "", transform=ax.transAxes)
+
+    def init():
+        scat.set_offsets(np.c_[pop_hist[0], fitness(np.array(pop_hist[0]))])
+        gen_text.set_text("Generation 0")
+        return scat, gen_text
+
+    def update(frame):
+        x = np.array(pop_hist[frame])
+        y = fitness(x)
+        scat.set_offsets(np.c_[x, y])
+        gen_text.set_text(f"Generation {frame}")
+        return scat, gen_text
+
+    anim = animation.FuncAnimation(
+        fig, update, init_func=init,
+        frames=len(pop_hist), interval=150, blit=True
+    )
 
-def update(frame):
-    x = np.array(pop_hist[frame])
-    y = fitness(x)
-    scat.set_offsets(np.c_[x, y])
-    gen_text.set_text(f"Generation {frame}")
-    return scat, gen_text
+    # save as mp4 (requires ffmpeg installed) and also show
+    writer = animation.FFMpegWriter(fps=10)
+    anim.save(mp4_path, writer=writer)
+    plt.show()
 
-anim = animation.FuncAnimation(
-    fig, update, init_func=init,
-    frames=len(pop_hist), interval=150, blit=True
-)
+def render(animate=True):
+    """Post-processing: figures and video from the files run_experiment wrote."""
+    plot_aggregate(ResultsStore(RUNS_DIR).load("best")["best"])
 
-# save as mp4 (requires ffmpeg installed) and also show
-mp4_path = os.path.join(OUTDIR, "deceptive_evolution.mp4")
-writer = animation.FFMpegWriter(fps=10)
-anim.save(mp4_path, writer=writer)
-plt.show()
+    if animate:
+        # choose one run to animate (e.g. first)
+        history, _ = load_history(POP_HIST_FN)
+        animate_run(history[0, :, :, 0], os.path.join(OUTDIR, "deceptive_evolution.mp4"))
 
+def main(argv=None):
+    experiment_main(run_experiment, render, argv, "Classical GA on the deceptive twin-peaks landscape")
 
+if __name__ == "__main__":
+    main()
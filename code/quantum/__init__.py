@@ -0,0 +1,11 @@
+"""
+Quantum superposition / interference experiments on the twin-peaks
+landscape and the hybrid quantum-classical GA step.
+
+Importing any module here runs no experiment and loads no matplotlib.
+From the code/ directory:
+
+    python -m quantum.hybridTest
+    python -m quantum.hybrid_ga
+    python -m quantum.hybrid_rastrigin
+"""
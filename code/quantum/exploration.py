@@ -0,0 +1,285 @@
+import functools
+
+import numpy as np
+
+from classical.rng import uniform_block
+
+from .measurement import AliasSampler, sample_indices
+
+# ============================================================
+# INCREMENTAL QUANTUM EXPLORATION
+# ------------------------------------------------------------
+# quantum_explore (hybridTest.py) encodes the population's occupancy
+# histogram on an M-bin grid as amplitudes, mixes them with the DFT and
+# resamples from |psi|^2. The normalization of psi cancels in |psi|^2,
+# so the state only depends on the DFT of the raw counts, which is
+# linear in them.
+#
+# ExplorationOperator keeps the histogram and its spectrum between
+# calls. Replacing individuals updates the histogram in O(replaced + M);
+# the spectrum is brought up to date only when a sampler is requested:
+# with one DFT column per changed bin (O(M) each) when few bins
+# changed, with a full FFT otherwise. explore() then draws from it by
+# inverse CDF; sampler() builds an alias table for repeated draws from
+# one state. Grids and DFT twiddles are cached per (x_min, x_max, M).
+# ============================================================
+
+@functools.lru_cache(maxsize=None)
+def explore_grid(x_min, x_max, M):
+    """Read-only grid linspace(x_min, x_max, M) that explored samples land on."""
+    x_grid = np.linspace(x_min, x_max, M)
+    x_grid.setflags(write=False)
+    return x_grid
+
+@functools.lru_cache(maxsize=None)
+def _twiddles(M):
+    # DFT matrix entry W[j, k] = w[(j * k) % M]
+    w = np.exp(-2j * np.pi * np.arange(M) / M)
+    w.setflags(write=False)
+    return w
+
+
+def occupancy_histogram(population, x_min, x_max, M):
+    """
+    Counts of the M equal-width bins on [x_min, x_max] (np.histogram's
+    binning, points outside are dropped) for populations (..., POP)
+    -> (..., M).
+    """
+    population = np.asarray(population)
+    batch, n = population.shape[:-1], population.shape[-1]
+    inside = (population >= x_min) & (population <= x_max)
+    bins = ((population - x_min) * (M / (x_max - x_min))).astype(np.intp)
+    np.clip(bins, 0, M - 1, out=bins)
+    rows = int(np.prod(batch))
+    flat = bins.reshape(rows, n) + (np.arange(rows) * M)[:, None]
+    hist = np.bincount(flat.ravel(), weights=inside.ravel(), minlength=rows * M)
+    return hist.reshape(batch + (M,))
+
+
+class ExplorationOperator:
+    """
+    Stateful quantum_explore for a population, or a batch (B, POP) of
+    populations, on [x_min, x_max] with M bins.
+    """
+
+    def __init__(self, population, x_min, x_max, M):
+        self.x_min, self.x_max, self.M = x_min, x_max, M
+        self.x_grid = explore_grid(x_min, x_max, M)
+        self.hist = occupancy_histogram(population, x_min, x_max, M)
+        self._spectrum = np.fft.fft(self.hist, axis=-1)
+        self._synced = self.hist.copy()
+
+    def replace(self, removed, added, rows=None):
+        """
+        Individuals `removed` leave and `added` join the population
+        (for a batch: (B, k) arrays, or (len(rows), k) for the selected
+        rows only). Only the histogram is touched here.
+        """
+        args = (self.x_min, self.x_max, self.M)
+        delta = occupancy_histogram(added, *args) - occupancy_histogram(removed, *args)
+        if rows is None:
+            self.hist += delta
+        else:
+            self.hist[rows] += delta
+
+    def spectrum(self, rows=None):
+        """DFT of the current histogram (unnormalized), updated lazily."""
+        sel = slice(None) if rows is None else rows
+        delta = self.hist[sel] - self._synced[sel]
+        changed = np.flatnonzero(np.any(delta != 0, axis=tuple(range(delta.ndim - 1))))
+
+        if 0 < len(changed) <= np.log2(self.M):
+            # one DFT row per changed bin (the matrix is symmetric)
+            k = np.arange(self.M)
+            W = _twiddles(self.M)[np.outer(changed, k) % self.M]
+            self._spectrum[sel] += delta[..., changed] @ W
+        elif len(changed):
+            self._spectrum[sel] = np.fft.fft(self.hist[sel], axis=-1)
+        self._synced[sel] = self.hist[sel]
+        return self._spectrum[sel]
+
+    def probabilities(self, rows=None):
+        """|DFT(psi)|^2 (unnormalized) for the current population(s)."""
+        probs = np.abs(self.spectrum(rows)) ** 2
+        # a population with no point on the grid maps to the uniform
+        # state, whose DFT is concentrated on bin 0
+        empty = probs.sum(axis=-1) == 0
+        probs[..., 0] = np.where(empty, 1.0, probs[..., 0])
+        return probs
+
+    def sampler(self, rows=None):
+        """AliasSampler of the current state(s), for repeated draws."""
+        return AliasSampler(self.probabilities(rows))
+
+    def explore(self, n, rng=None, u=None, rows=None):
+        """n grid points per population, drawn from the mixed state."""
+        # the state changes between calls, so no alias table is built
+        return self.x_grid[sample_indices(self.probabilities(rows), n, rng, u)]
+
+
+# ===================== D-DIMENSIONAL EXPLORATION =====================
+# The same operator on an M^D grid: histogram of the (N, D) population,
+# np.fft.fftn mixing, |.|^2 sampling. Up to max_cells grid cells the
+# dense histogram is transformed directly. Beyond that the spectrum is
+# never formed: the DFT is separable and the histogram has at most N
+# occupied cells, so each frequency coordinate k_d is drawn from its
+# exact conditional given k_1..k_{d-1},
+#
+#   P(k_d | k_<d) ~ sum_g | sum_{j in g} h_j exp(-2i*pi (k_<=d . j_<=d) / M) |^2
+#
+# where g groups occupied cells with equal trailing indices j_>d. Many
+# small groups expand the square into cell pairs of a group, whose
+# products summed by index shift give P(. | k_<d) with one length-M FFT;
+# few large groups are summed per (group, j_d) and transformed with one
+# matmul. Either way the cost per shot is set by the occupied cells and
+# their grouping, not by M^D, and shots run in chunks whose buffers hold
+# about max_cells complex values (one shot at a time when a single shot
+# needs more).
+
+MAX_CELLS = 1 << 20
+
+def _cell_indices(population, x_min, x_max, M):
+    # per-axis bin indices of the points inside the box (np.histogramdd binning)
+    inside = np.all((population >= x_min) & (population <= x_max), axis=-1)
+    bins = ((population[inside] - x_min) * (M / (x_max - x_min))).astype(np.intp)
+    return np.clip(bins, 0, M - 1, out=bins)
+
+def _inverse_cdf(probs, u):
+    # one draw per row of probs (S, M) from uniforms u (S,)
+    cdf = np.cumsum(probs, axis=-1)
+    k = (cdf < (u * cdf[:, -1])[:, None]).sum(axis=-1)
+    return np.minimum(k, probs.shape[-1] - 1)
+
+def _dense_frequencies(cells, D, M, u):
+    # one inverse-CDF draw per shot over the flattened M^D spectrum
+    hist = np.zeros((M,) * D)
+    np.add.at(hist, tuple(cells.T), 1.0)
+    probs = np.abs(np.fft.fftn(hist)).ravel() ** 2
+    cdf = np.cumsum(probs)
+    flat = np.minimum(np.searchsorted(cdf, u[:, 0] * cdf[-1], side="right"), M**D - 1)
+    return np.stack(np.unravel_index(flat, (M,) * D), axis=-1)
+
+def _group_plan(occupied, d, M):
+    # How to sum over the groups of axis d (cells with equal j_>d), with
+    # the complex values one shot needs. Many small groups: all ordered
+    # cell pairs (j, j') of a group and the shift (j_d - j'_d) % M.
+    # Few large groups: cells sorted by (group, j_d), where each such key
+    # starts and its slot in the (groups * M) table.
+    n_occ, D = occupied.shape
+    if d == D - 1:
+        group = np.zeros(n_occ, dtype=np.intp)
+    else:
+        _, group = np.unique(occupied[:, d + 1:], axis=0, return_inverse=True)
+        group = group.ravel()
+    size = np.bincount(group)
+    n_pairs = int(np.sum(size ** 2))
+
+    if n_pairs <= len(size) * M * M // 16:
+        order = np.argsort(group, kind="stable")
+        first = np.cumsum(size) - size                             # group starts in order
+        reps = size[group[order]]
+        left = np.repeat(order, reps)
+        offset = np.arange(n_pairs) - np.repeat(np.cumsum(reps) - reps, reps)
+        right = order[np.repeat(first[group[order]], reps) + offset]
+        shift = (occupied[left, d] - occupied[right, d]) % M
+        return ("pairs", left, right, shift), n_pairs
+
+    key = group * M + occupied[:, d]
+    order = np.argsort(key, kind="stable")
+    starts = np.flatnonzero(np.diff(key[order], prepend=-1))
+    return ("table", order, starts, key[order][starts], len(size)), len(size) * M + n_occ
+
+def _sparse_frequencies(cells, D, M, u, max_cells=MAX_CELLS):
+    occupied, h = np.unique(cells, axis=0, return_counts=True)
+    k = np.arange(M)
+    W = _twiddles(M)[np.outer(k, k) % M]                           # (M, M) DFT
+    plans, width = zip(*(_group_plan(occupied, d, M) for d in range(D)))
+    S = len(u)
+    freq = np.empty((S, D), dtype=np.intp)
+    # a chunk's buffer, the gathered factors and their products share
+    # max_cells
+    chunk = max(1, max_cells // (4 * max(width)))
+
+    for start in range(0, S, chunk):
+        sl = slice(start, start + chunk)
+        s = len(u[sl])
+        phase = np.tile(h.astype(complex), (s, 1))                # (s, occupied)
+        rows = np.arange(s)[:, None] * M
+        for d in range(D):
+            plan = plans[d]
+            if plan[0] == "pairs":
+                # sum_g |sum_j a_j w^(j_d k)|^2 = sum_shift c_shift w^(shift k)
+                _, left, right, shift = plan
+                prod = phase[:, left]
+                prod *= phase[:, right].conj()
+                flat = (rows + shift).ravel()
+                c = np.bincount(flat, prod.real.ravel(), s * M) \
+                    + 1j * np.bincount(flat, prod.imag.ravel(), s * M)
+                probs = np.fft.fft(c.reshape(s, M), axis=-1).real
+            else:
+                _, order, starts, keys, n_groups = plan
+                table = np.zeros((s, n_groups * M), dtype=complex)
+                table[:, keys] = np.add.reduceat(phase[:, order], starts, axis=1)
+                amp = table.reshape(s, n_groups, M) @ W            # (s, groups, M)
+                probs = np.einsum("sgk,sgk->sk", amp.real, amp.real)
+                probs += np.einsum("sgk,sgk->sk", amp.imag, amp.imag)
+            freq[sl, d] = _inverse_cdf(np.maximum(probs, 0.0), u[sl, d])
+            phase *= W[freq[sl, d][:, None], occupied[:, d]]
+    return freq
+
+
+def explore_nd(population, n, x_min, x_max, M, rng=None, u=None, max_cells=MAX_CELLS):
+    """
+    D-dimensional quantum_explore: n points on the M^D grid drawn from
+    |fftn(psi)|^2, psi the occupancy histogram of population (N, D).
+
+    u: optional pre-drawn uniforms (n, D). max_cells bounds both the
+    dense grid size and the chunk size of the sparse path.
+    """
+    population = np.asarray(population)
+    D = population.shape[-1]
+    u = uniform_block((n, D), rng, u)
+    axis = explore_grid(x_min, x_max, M)
+
+    cells = _cell_indices(population, x_min, x_max, M)
+    if len(cells) == 0:
+        # empty histogram -> uniform state -> all mass on frequency 0
+        freq = np.zeros((n, D), dtype=np.intp)
+    elif M**D <= max_cells:
+        freq = _dense_frequencies(cells, D, M, u)
+    else:
+        freq = _sparse_frequencies(cells, D, M, u, max_cells)
+    return axis[freq]
+
+
+def largest_basin_fraction(pop, spacing=1.0):
+    """
+    Share of the population (N, D) in its most crowded lattice basin
+    (points rounded to the nearest multiple of spacing), the D-dimensional
+    analogue of basin_occupancy for Rastrigin-type landscapes.
+    """
+    basins = np.round(np.asarray(pop) / spacing)
+    _, counts = np.unique(basins, axis=0, return_counts=True)
+    return counts.max() / len(basins)
+
+
+class NDExplorer:
+    """
+    Collapse-triggered exploration hook for run_ga_rastrigin_nd /
+    run_ga_rastrigin_2d: when more than `threshold` of the population
+    sits in one lattice basin, return a population resampled with
+    explore_nd, else None. Picklable, so it works with runner.run_trials.
+    """
+
+    def __init__(self, domain, M=64, threshold=0.9, spacing=1.0, max_cells=MAX_CELLS):
+        self.domain = tuple(domain)
+        self.M = M
+        self.threshold = threshold
+        self.spacing = spacing
+        self.max_cells = max_cells
+
+    def __call__(self, pop, rng=None):
+        if largest_basin_fraction(pop, self.spacing) <= self.threshold:
+            return None
+        return explore_nd(pop, len(pop), self.domain[0], self.domain[1], self.M,
+                          rng=rng, max_cells=self.max_cells)
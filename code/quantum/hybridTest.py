@@ -1,5 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from classical.landscapes import get_landscape
+from classical.selection import top_k, tournament_winners
+
+from .exploration import ExplorationOperator, occupancy_histogram
+from .measurement import sample_indices
 
 # ===============================
 # 1. Problem setup
@@ -10,54 +15,56 @@ POP = 200
 M = 128          # discretization for quantum state
 ELITISM = 10
 TOURNAMENT_K = 5
-np.random.seed(42)
 
-def fitness_twin_peaks(x):
-    return 10*np.exp(-(x-3)**2) + 5*np.exp(-(x+3)**2)
+fitness_twin_peaks = get_landscape("twin_peaks")
 
 # ===============================
 # 2. Classical selection
 # ===============================
 
 def tournament_selection(pop, fit, k, elitism):
-    new_pop = []
-    elite_idx = np.argsort(fit)[-elitism:]
-    new_pop.extend(pop[elite_idx])
-
-    while len(new_pop) < len(pop):
-        idx = np.random.choice(len(pop), k, replace=False)
-        winner = idx[np.argmax(fit[idx])]
-        new_pop.append(pop[winner])
-
-    return np.array(new_pop)
+    # pop / fit: (..., POP); leading axes are independent populations
+    elite_idx = top_k(fit, elitism)
+    winners = tournament_winners(fit, k, n_select=pop.shape[-1] - elitism, replace=False)
+    return np.concatenate([np.take_along_axis(pop, elite_idx, axis=-1),
+                           np.take_along_axis(pop, winners, axis=-1)], axis=-1)
 
 # ===============================
 # 3. Quantum exploration step
 # ===============================
 
-def quantum_explore(population):
+def population_histogram(population):
+    """
+    Occupancy counts of the M equal-width bins on [X_MIN, X_MAX]
+    (np.histogram's binning) for populations (..., POP) -> (..., M).
+    """
+    return occupancy_histogram(population, X_MIN, X_MAX, M)
+
+def explore_sampler(population):
+    """
+    Alias-table sampler of the mixed state encoding the population
+    density; a batch of populations (..., POP) gives one state each.
+    For repeated exploration of a changing population keep an
+    ExplorationOperator (exploration.py) instead.
+    """
+    # histogram -> amplitudes -> DFT -> |psi|^2 (all-zero -> uniform state)
+    return ExplorationOperator(population, X_MIN, X_MAX, M).sampler()
+
+def quantum_explore(population, rng=None, sampler=None):
+    """
+    Resample the population from the mixed state. Pass a sampler from
+    explore_sampler() to draw repeatedly from the same state without
+    rebuilding its alias table.
+    """
     # discretize domain
-    x_grid = np.linspace(X_MIN, X_MAX, M)
-
-    # encode population density as amplitudes
-    hist, _ = np.histogram(population, bins=M, range=(X_MIN, X_MAX))
-    psi = hist.astype(float)
-
-    # if population collapses completely, avoid zero state
-    if np.linalg.norm(psi) == 0:
-        psi[:] = 1.0
-
-    psi = psi / np.linalg.norm(psi)
-
-    # coherent global mixing (DFT)
-    psi_mixed = np.fft.fft(psi) / np.sqrt(M)
-
-    # measurement probabilities
-    probs = np.abs(psi_mixed)**2
-    probs = probs / probs.sum()
+    x_grid, _ = fitness_twin_peaks.grid(M)
 
     # resample population
-    indices = np.random.choice(M, size=len(population), p=probs)
+    if sampler is None:
+        probs = ExplorationOperator(population, X_MIN, X_MAX, M).probabilities()
+        indices = sample_indices(probs, len(population), rng)
+    else:
+        indices = sampler.sample(len(population), rng)
     new_population = x_grid[indices]
 
     return new_population
@@ -67,66 +74,76 @@ def quantum_explore(population):
 # ===============================
 
 def basin_occupancy(pop):
-    left = np.mean(pop < 0)
-    right = np.mean(pop >= 0)
+    # per population along the last axis, so (trials, POP) works too
+    left = np.mean(pop < 0, axis=-1)
+    right = np.mean(pop >= 0, axis=-1)
     return left, right
 
 def collapsed(pop, threshold=0.9):
     left, right = basin_occupancy(pop)
-    return (left > threshold) or (right > threshold)
+    return (left > threshold) | (right > threshold)
 
-# ===============================
-# 5. One-generation comparison
-# ===============================
+def main():
+    # ===============================
+    # 5. One-generation comparison
+    # ===============================
 
-# initial population
-population = np.random.uniform(X_MIN, X_MAX, size=POP)
-fitness = fitness_twin_peaks(population)
+    np.random.seed(42)
 
-print("Initial basin occupancy:", basin_occupancy(population))
+    # initial population
+    population = np.random.uniform(X_MIN, X_MAX, size=POP)
+    fitness = fitness_twin_peaks(population)
 
-# ----- Classical-only step -----
-classical_selected = tournament_selection(
-    population,
-    fitness,
-    TOURNAMENT_K,
-    ELITISM
-)
+    print("Initial basin occupancy:", basin_occupancy(population))
 
-print("After classical selection:", basin_occupancy(classical_selected))
+    # ----- Classical-only step -----
+    classical_selected = tournament_selection(
+        population,
+        fitness,
+        TOURNAMENT_K,
+        ELITISM
+    )
 
-# ----- Hybrid step (collapse-triggered) -----
-if collapsed(population):
-    print("Collapse detected → applying quantum exploration")
-    explored = quantum_explore(population)
-else:
-    explored = population.copy()
+    print("After classical selection:", basin_occupancy(classical_selected))
 
-fitness_explored = fitness_twin_peaks(explored)
-hybrid_selected = tournament_selection(
-    explored,
-    fitness_explored,
-    TOURNAMENT_K,
-    ELITISM
-)
+    # ----- Hybrid step (collapse-triggered) -----
+    if collapsed(population):
+        print("Collapse detected → applying quantum exploration")
+        explored = quantum_explore(population)
+    else:
+        explored = population.copy()
 
-print("After hybrid step:", basin_occupancy(hybrid_selected))
+    fitness_explored = fitness_twin_peaks(explored)
+    hybrid_selected = tournament_selection(
+        explored,
+        fitness_explored,
+        TOURNAMENT_K,
+        ELITISM
+    )
 
-# ===============================
-# 6. Visualization
-# ===============================
+    print("After hybrid step:", basin_occupancy(hybrid_selected))
+
+    # ===============================
+    # 6. Visualization
+    # ===============================
+
+    import matplotlib.pyplot as plt
+
+    xs, fs = fitness_twin_peaks.grid(1000)
+    plt.figure(figsize=(10,4))
+    plt.plot(xs, fs, label="Fitness landscape")
+
+    plt.scatter(classical_selected, fitness_twin_peaks(classical_selected),
+                s=10, alpha=0.6, label="Classical")
+    plt.scatter(hybrid_selected, fitness_twin_peaks(hybrid_selected),
+                s=10, alpha=0.6, label="Hybrid")
 
-xs = np.linspace(X_MIN, X_MAX, 1000)
-plt.figure(figsize=(10,4))
-plt.plot(xs, fitness_twin_peaks(xs), label="Fitness landscape")
+    plt.legend()
+    plt.title("Classical vs Hybrid (one generation)")
+    plt.xlabel("x")
+    plt.ylabel("fitness")
+    plt.show()
 
-plt.scatter(classical_selected, fitness_twin_peaks(classical_selected),
-            s=10, alpha=0.6, label="Classical")
-plt.scatter(hybrid_selected, fitness_twin_peaks(hybrid_selected),
-            s=10, alpha=0.6, label="Hybrid")
 
-plt.legend()
-plt.title("Classical vs Hybrid (one generation)")
-plt.xlabel("x")
-plt.ylabel("fitness")
-plt.show()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import time
+
+import numpy as np
+
+from classical.operators import blend_crossover, gaussian_mutate
+from classical.profiling import lap_timer
+from classical.rng import TrialGenerators
+from classical.selection import top_k, tournament_winners
+
+from .exploration import ExplorationOperator
+from .hybridTest import (
+    ELITISM, M, POP, TOURNAMENT_K, X_MAX, X_MIN,
+    basin_occupancy, collapsed, fitness_twin_peaks,
+)
+
+# ============================================================
+# MULTI-GENERATION HYBRID GA
+# ------------------------------------------------------------
+# hybridTest.py's single step, run for many generations on a batch of
+# trials stored as (trials, POP) rows:
+#
+#   collapse check (basin_occupancy) -> quantum re-exploration of the
+#   collapsed rows -> elitism + tournaments -> blend crossover ->
+#   Gaussian mutation -> best children fill the remaining slots
+#
+# Re-exploration resamples a collapsed population from the DFT-mixed
+# state of its density (quantum_explore) but keeps its elites, so the
+# best point found so far is never lost. The occupancy histograms are
+# kept by an ExplorationOperator (exploration.py) and updated as
+# individuals are replaced, so firing does not rebuild them. Every
+# trial draws from its own generator, as in classical/engine.py.
+# ============================================================
+
+def run_hybrid_ga(
+    trials,
+    pop_size=POP,
+    gens=100,
+    elitism=ELITISM,
+    tournament_k=TOURNAMENT_K,
+    crossover_prob=0.8,
+    mutation_pm=0.2,
+    mutation_sigma=0.5,
+    collapse_threshold=0.9,
+    explore=True,
+    fitness_fn=fitness_twin_peaks,
+    seed=None,
+    profiler=None,
+    dtype=np.float64,
+):
+    """
+    Evolve `trials` hybrid GA populations together.
+
+    explore=False runs the same loop without quantum re-exploration
+    (the classical baseline with identical random streams).
+
+    Returns (trials, gens) histories "best", "mean", "left" (left-basin
+    occupancy), "fired" (bool: exploration ran before that generation),
+    plus "final_pop", "final_scores", "explorations" (firings per
+    trial), "evaluations" and "explore_evaluations" (fitness calls per
+    trial, total and spent on re-explored individuals),
+    "explore_seconds" (wall time of the exploration step per
+    generation) and "seconds" (whole run).
+    profiler: a Profiler (classical/profiling.py) for per-phase timings
+    and the on_generation / on_collapse hooks; with explore=True,
+    on_collapse follows the basin-occupancy detector.
+    dtype: float type of populations, scores and histories, as in
+    run_batched_ga; the occupancy spectra stay complex128 because they
+    are updated incrementally over the whole run.
+    """
+    start = time.perf_counter()
+    rng = TrialGenerators.from_seed(seed, trials)
+    T, N, E = trials, pop_size, elitism
+    domain = (X_MIN, X_MAX)
+
+    pop = rng.uniform(X_MIN, X_MAX, size=(T, N)).astype(dtype, copy=False)
+    explorer = ExplorationOperator(pop, X_MIN, X_MAX, M) if explore else None
+    scores = fitness_fn(pop).astype(dtype, copy=False)
+    n_evals = np.full(T, N)
+    explore_evals = np.zeros(T, dtype=int)
+
+    best_hist = np.empty((T, gens), dtype=dtype)
+    mean_hist = np.empty((T, gens), dtype=dtype)
+    left_hist = np.empty((T, gens))
+    fired_hist = np.zeros((T, gens), dtype=bool)
+    explore_seconds = np.zeros(gens)
+
+    # one uniform and one normal block per trial per generation:
+    # [tournaments | crossover pairs | mutation mask | exploration shots]
+    n_sel, n_cx = N * tournament_k, 2 * (N // 2)
+    u = np.empty((T, n_sel + n_cx + 2 * N))
+    noise = np.empty((T, N))
+    parents = np.empty((T, N), dtype=dtype)
+    children = np.empty((T, N), dtype=dtype)
+    row_offset = (np.arange(T) * N)[:, None]
+    replaced = np.empty((T, N), dtype=bool)
+    fired = None
+    if profiler is not None:
+        profiler.begin((T,))
+    lap = lap_timer(profiler)
+
+    for g in range(gens):
+        rng.random(out=u)
+        rng.standard_normal(out=noise)
+        lap("random")
+
+        # ---- collapse detection + quantum re-exploration ----
+        if explore:
+            t0 = time.perf_counter()
+            fired = collapsed(pop, collapse_threshold)
+            if fired.any():
+                keep = top_k(scores[fired], E)
+                elites = np.take_along_axis(pop[fired], keep, axis=1)
+                elite_scores = np.take_along_axis(scores[fired], keep, axis=1)
+
+                leaving = np.ones(keep.shape[:1] + (N,), dtype=bool)
+                np.put_along_axis(leaving, keep, False, axis=1)
+                explored = explorer.explore(N, u=u[fired, -N:], rows=fired).astype(dtype, copy=False)
+                explored[:, :E] = elites
+                explored_scores = fitness_fn(explored[:, E:]).astype(dtype, copy=False)
+
+                explorer.replace(pop[fired][leaving].reshape(-1, N - E),
+                                 explored[:, E:], rows=fired)
+                pop[fired] = explored
+                scores[fired] = np.concatenate([elite_scores, explored_scores], axis=1)
+                n_evals[fired] += N - E
+                explore_evals[fired] += N - E
+                fired_hist[:, g] = fired
+            explore_seconds[g] = time.perf_counter() - t0
+            lap("exploration")
+
+        best_hist[:, g] = scores.max(axis=1)
+        mean_hist[:, g] = scores.mean(axis=1)
+        left_hist[:, g] = basin_occupancy(pop)[0]
+        lap("metrics")
+        if profiler is not None:
+            profiler.generation(g, collapsed=fired, trials=np.arange(T), pop=pop,
+                                scores=scores, best=best_hist[:, g],
+                                diversity=pop.std(axis=1), evaluations=n_evals)
+
+        # ---- elitism ----
+        elite_idx = top_k(scores, E)
+        elites = np.take_along_axis(pop, elite_idx, axis=1)
+        lap("elitism")
+
+        # ---- evolution ----
+        winners = tournament_winners(scores, tournament_k, replace=False,
+                                     u=u[:, :n_sel])
+        np.take(pop, winners + row_offset, out=parents)
+        lap("selection")
+        blend_crossover(parents, crossover_prob, out=children,
+                        u=u[:, n_sel:n_sel + n_cx])
+        lap("crossover")
+        gaussian_mutate(children, mutation_pm, mutation_sigma, domain,
+                        u=u[:, n_sel + n_cx:n_sel + n_cx + N], noise=noise)
+        lap("mutation")
+
+        child_scores = fitness_fn(children).astype(dtype, copy=False)
+        n_evals += N
+        lap("evaluation")
+        keep = top_k(child_scores, N - E, order="position")
+        survivors = np.take_along_axis(children, keep, axis=1)
+
+        if explorer is not None:
+            replaced.fill(True)
+            np.put_along_axis(replaced, elite_idx, False, axis=1)
+            explorer.replace(pop[replaced].reshape(T, N - E), survivors)
+
+        pop = np.concatenate([elites, survivors], axis=1)
+        scores = np.concatenate([np.take_along_axis(scores, elite_idx, axis=1),
+                                 np.take_along_axis(child_scores, keep, axis=1)], axis=1)
+        lap("replacement")
+
+    return {
+        "best": best_hist,
+        "mean": mean_hist,
+        "left": left_hist,
+        "fired": fired_hist,
+        "final_pop": pop,
+        "final_scores": scores,
+        "explorations": fired_hist.sum(axis=1),
+        "evaluations": n_evals,
+        "explore_evaluations": explore_evals,
+        "explore_seconds": explore_seconds,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def summarize(name, out, trials, gens):
+    best_x = out["final_pop"][np.arange(trials), out["final_scores"].argmax(axis=1)]
+    basin = fitness_twin_peaks.classify(best_x)
+    firings = out["explorations"].sum()
+    print(f"{name}:")
+    print(f"  final best (median)      = {np.median(out['best'][:, -1]):.4f}")
+    print(f"  trials ending right      = {np.mean(basin == 'right'):.2f}")
+    print(f"  explorations per trial   = {out['explorations'].mean():.2f}")
+    if firings:
+        per_firing = out["explore_seconds"].sum() / firings
+        print(f"  cost per firing          = {per_firing * 1e3:.3f} ms, "
+              f"{out['explore_evaluations'].sum() / firings:.0f} evaluations")
+    print(f"  throughput               = {trials * gens / out['seconds']:.0f} trial-gens/s, "
+          f"{out['evaluations'].sum() / out['seconds']:.0f} evals/s")
+
+
+def main(trials=30, gens=100, seed=42):
+    for name, explore in (("Classical", False), ("Hybrid", True)):
+        out = run_hybrid_ga(trials, gens=gens, explore=explore, seed=seed)
+        summarize(name, out, trials, gens)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+
+from classical.rastrigin_2d import POP_SIZE, GENS, TRIALS, run_ga_rastrigin_2d
+from classical.runner import run_trials
+
+from .exploration import NDExplorer
+
+# ============================================================
+# HYBRID GA ON 2-D RASTRIGIN
+# ------------------------------------------------------------
+# run_ga_rastrigin_2d with and without collapse-triggered 2-D quantum
+# exploration (exploration.NDExplorer: histogram on an M x M grid,
+# np.fft.fftn mixing, |psi|^2 resampling), same seeds for both.
+# ============================================================
+
+DOMAIN = (-5.12, 5.12)
+M = 64
+SUCCESS_RADIUS = 0.5     # best point inside the global basin
+
+
+def run(explorer, seed=0, workers=None):
+    start = time.perf_counter()
+    results = run_trials(run_ga_rastrigin_2d, TRIALS, seed=seed, workers=workers,
+                         pop_size=POP_SIZE, gens=GENS, domain=DOMAIN,
+                         record_history=False, explorer=explorer)
+    return results, time.perf_counter() - start
+
+
+def summarize(name, results, seconds):
+    final_dist = np.array([r["best_distance"][-1] for r in results])
+    explorations = np.array([r["explorations"] for r in results])
+    evaluations = np.array([r["evaluations"] for r in results])
+    print(f"{name}:")
+    print(f"  final distance (median)  = {np.median(final_dist):.4f}")
+    print(f"  success rate             = {np.mean(final_dist < SUCCESS_RADIUS):.2f}")
+    print(f"  explorations per trial   = {explorations.mean():.2f}")
+    print(f"  evaluations per trial    = {evaluations.mean():.0f}")
+    print(f"  wall time                = {seconds:.2f} s")
+
+
+def main(seed=0, workers=None):
+    for name, explorer in (("Classical", None),
+                           ("Hybrid (2-D fftn exploration)", NDExplorer(DOMAIN, M))):
+        results, seconds = run(explorer, seed, workers)
+        summarize(name, results, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import numpy as np
+
+from classical.rng import uniform_block
+
+from .statevector import probabilities
+
+# ============================================================
+# BASIN READOUT
+# ------------------------------------------------------------
+# The probability of finding a state in a basin is a masked sum of
+# |psi|^2, so the experiments read it off exactly in O(M) per state
+# instead of counting 10^4 samples. A finite-shot mode is kept for
+# comparisons with sampling noise: one multinomial draw per state
+# gives the per-bin counts of all shots at once.
+#
+# When individual outcomes are needed (resampling a population from a
+# state), sample_indices draws them by inverse CDF, batched over states;
+# it matches np.random.choice(M, shots, p=p) for the same uniforms. A
+# state that is resampled many times can instead get an AliasSampler,
+# which builds a Walker/Vose alias table once (a Python loop, O(M)) and
+# then draws every shot in O(1).
+#
+# rng: np.random.Generator, or None for the global np.random stream
+# the scripts seed with np.random.seed.
+# ============================================================
+
+def basin_masks(landscape, x_grid):
+    """
+    (labels, masks): the landscape's basin labels and a (K, M) boolean
+    matrix marking the grid points in each basin (same priority rules
+    as Landscape.classify).
+    """
+    point_labels = landscape.classify(x_grid)
+    labels = list(landscape.basins)
+    return labels, np.stack([point_labels == label for label in labels])
+
+
+def sample_counts(probs, shots, rng=None):
+    """Per-bin counts of `shots` measurements of each distribution in probs (..., M)."""
+    probs = np.asarray(probs)
+    if isinstance(rng, np.random.Generator):
+        return rng.multinomial(shots, probs)
+    rng = np.random if rng is None else rng
+    flat = probs.reshape(-1, probs.shape[-1])
+    counts = np.stack([rng.multinomial(shots, p / p.sum()) for p in flat])
+    return counts.reshape(probs.shape)
+
+
+def basin_probabilities(psi, masks, shots=None, rng=None):
+    """
+    Basin masses (..., K) and per-bin probabilities (..., M) of the
+    states psi (..., M) for basin masks (K, M).
+
+    shots=None gives the exact Born-rule values; an integer replaces
+    them by the observed frequencies of that many measurements.
+    """
+    probs = probabilities(psi)
+    if shots is not None:
+        probs = sample_counts(probs, shots, rng) / shots
+    return probs @ np.asarray(masks, dtype=probs.dtype).T, probs
+
+
+# ===================== ONE-SHOT SAMPLING =====================
+def sample_indices(probs, shots, rng=None, u=None):
+    """
+    Grid indices (..., shots), `shots` draws from each distribution in
+    probs (..., M) by inverse CDF: one cumsum and one searchsorted for
+    the whole batch, no per-state setup. u: optional pre-drawn uniforms
+    of the output shape.
+    """
+    probs = np.asarray(probs, dtype=float)
+    batch, M = probs.shape[:-1], probs.shape[-1]
+    u = uniform_block(batch + (shots,), rng, u)
+    cdf = np.cumsum(probs, axis=-1)
+    cdf /= cdf[..., -1:]
+    # one sorted array for all states: state r's cdf is shifted to (r, r + 1]
+    rows = np.arange(int(np.prod(batch)))[:, None]
+    flat = (cdf.reshape(-1, M) + rows).ravel()
+    idx = np.searchsorted(flat, (u.reshape(-1, shots) + rows).ravel(), side="right")
+    idx = idx.reshape(-1, shots) - rows * M
+    return np.minimum(idx, M - 1).reshape(batch + (shots,))
+
+
+# ===================== ALIAS-TABLE SAMPLER =====================
+def _vose_table(p):
+    """Vose's alias table (prob, alias) for one distribution p (M,)."""
+    M = len(p)
+    scaled = p * (M / p.sum())
+    prob = np.ones(M)
+    alias = np.arange(M)
+    small = list(np.flatnonzero(scaled < 1))
+    large = list(np.flatnonzero(scaled >= 1))
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] += scaled[s] - 1
+        (small if scaled[l] < 1 else large).append(l)
+    # leftovers are 1 up to rounding
+    return prob, alias
+
+
+class AliasSampler:
+    """
+    Reusable Born-rule sampler for states or distributions (..., M).
+
+    The alias tables cost O(M) per state to build (in Python, so far
+    more than a sample_indices call); each shot then needs one uniform,
+    one table lookup and one comparison. Worth it only when the same
+    distribution is resampled many times.
+    """
+
+    def __init__(self, probs):
+        probs = np.asarray(probs, dtype=float)
+        flat = probs.reshape(-1, probs.shape[-1])
+        tables = [_vose_table(p) for p in flat]
+        self.M = probs.shape[-1]
+        self.prob = np.stack([t[0] for t in tables]).reshape(probs.shape)
+        self.alias = np.stack([t[1] for t in tables]).reshape(probs.shape)
+
+    @classmethod
+    def from_state(cls, psi):
+        return cls(probabilities(psi))
+
+    def sample(self, shots, rng=None, u=None):
+        """
+        Grid indices (..., shots), one row of shots per distribution.
+
+        u: optional pre-drawn uniforms of that shape; the integer part of
+        u*M picks the column, the fractional part decides alias or not.
+        """
+        x = uniform_block(self.prob.shape[:-1] + (shots,), rng, u) * self.M
+        idx = np.minimum(x.astype(np.intp), self.M - 1)
+        x -= idx
+        keep = x < np.take_along_axis(self.prob, idx, axis=-1)
+        return np.where(keep, idx, np.take_along_axis(self.alias, idx, axis=-1))
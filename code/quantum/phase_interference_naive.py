@@ -1,47 +1,67 @@
 
 import numpy as np
-import matplotlib.pyplot as plt
+
+from classical.landscapes import get_landscape
+
+from .measurement import basin_masks, basin_probabilities
+from .statevector import apply_phase, dft, fitness_phases, uniform_states
 
 X_MIN, X_MAX = -6.0, 6.0
 
-def fitness(x):
-    return 10*np.exp(-(x-3)**2) + 5*np.exp(-(x+3)**2)
+fitness = get_landscape("twin_peaks")
 
 M = 256
-x_grid = np.linspace(X_MIN, X_MAX, M)
-f_vals = fitness(x_grid)
+x_grid, f_vals = fitness.grid(M)
 
 
-def classical_sampling(N):
-    xs = np.random.uniform(X_MIN, X_MAX, size=N)
-    left = np.sum(xs < 0)
-    right = np.sum(xs >= 0)
-    return left/N, right/N
+def classical_sampling(N=None):
+    # uniform over the grid, i.e. the Born rule of the uniform state
+    return measure_state(uniform_states(M), x_grid, N)
 
-def fitness_phase_state(x_grid, f_vals, alpha):
-    psi = np.exp(1j * alpha * f_vals)
-    psi = psi / np.linalg.norm(psi)
-    return psi
+def fitness_phase_state(x_grid, f_vals, alpha, dtype=np.complex128):
+    """psi_i ~ exp(i*alpha*f(x_i)); a sequence of alphas gives one row each."""
+    phases = alpha * f_vals if np.ndim(alpha) == 0 else fitness_phases(f_vals, alpha)
+    return apply_phase(uniform_states(len(x_grid), dtype=dtype), phases)
 
 def mix_state(psi):
-    return np.fft.fft(psi) / np.sqrt(len(psi))
+    return dft(psi)
 
 
-def measure_state(psi, x_grid, N):
-    probs = np.abs(psi)**2
-    idx = np.random.choice(len(x_grid), size=N, p=probs)
-    xs = x_grid[idx]
-    left = np.sum(xs < 0)
-    right = np.sum(xs >= 0)
-    return left/N, right/N
+def measure_state(psi, x_grid, N=None):
+    """(left, right) basin probabilities; exact, or frequencies of N shots."""
+    _, masks = basin_masks(fitness, x_grid)
+    masses, _ = basin_probabilities(psi, masks, N)
+    return masses[..., 0], masses[..., 1]
 
-N = 20_000
+N = None  # None: exact probabilities; e.g. 20_000 for finite-shot estimates
 alphas = [0.0, 0.05, 0.1, 0.2, 0.4]
 
-print("Classical baseline:", classical_sampling(N))
 
-for alpha in alphas:
-    psi = fitness_phase_state(x_grid, f_vals, alpha)
-    psi_mixed = mix_state(psi)
-    L, R = measure_state(psi_mixed, x_grid, N)
-    print(f"alpha={alpha:.2f} → Left={L:.3f}, Right={R:.3f}")
+def basin_capture(M, alphas, shots=None, seed=None, dtype="complex128"):
+    """
+    Left/right capture of the fitness-phase + DFT state at resolution M
+    for every alpha; a run function for classical.sweep.run_sweep, e.g.
+    over M and shots with all alphas of a sweep cell in one batch.
+    dtype: state precision ("complex64" for single precision).
+    """
+    if seed is not None:
+        np.random.seed(seed)
+    x_grid, f_vals = fitness.grid(M)
+    psi = mix_state(fitness_phase_state(x_grid, f_vals, alphas, dtype))
+    left, right = measure_state(psi, x_grid, shots)
+    return {"alpha": np.asarray(alphas, dtype=float), "left": left, "right": right}
+
+
+def main():
+    L, R = classical_sampling(N)
+    print(f"Classical baseline: Left={L:.3f}, Right={R:.3f}")
+
+    # the whole sweep is one (len(alphas), M) batch, one FFT and one readout
+    psi_mixed = mix_state(fitness_phase_state(x_grid, f_vals, alphas))
+    Ls, Rs = measure_state(psi_mixed, x_grid, N)
+    for alpha, L, R in zip(alphas, Ls, Rs):
+        print(f"alpha={alpha:.2f} → Left={L:.3f}, Right={R:.3f}")
+
+
+if __name__ == "__main__":
+    main()
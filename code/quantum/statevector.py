@@ -0,0 +1,66 @@
+import numpy as np
+
+# ============================================================
+# BATCHED STATE-VECTOR SIMULATOR
+# ------------------------------------------------------------
+# A batch of B states over an M-point grid is one (B, M) complex
+# array; every gate acts along the last axis, so any leading axes are
+# batch axes and a single 1-D state (M,) works unchanged.
+#
+# Phase encodings are diagonal gates (elementwise exp(i*phase)),
+# mixers are unitaries on the grid register. A parameter sweep
+# (alphas, phis, ...) becomes one phase matrix and one batched FFT
+# instead of a Python loop over states.
+#
+# The precision is the dtype of the states: complex64 states stay
+# complex64 through every gate and give float32 probabilities.
+# ============================================================
+
+# ===================== STATES =====================
+def uniform_states(M, batch=(), dtype=np.complex128):
+    """|psi> = (1/sqrt(M)) sum_i |i>, shape (*batch, M)."""
+    shape = (batch,) if np.isscalar(batch) else tuple(batch)
+    return np.full(shape + (M,), 1 / np.sqrt(M), dtype=dtype)
+
+def normalize(psi):
+    """Scale every state of the batch to unit norm (in place)."""
+    psi /= np.linalg.norm(psi, axis=-1, keepdims=True)
+    return psi
+
+# ===================== PHASE ENCODINGS =====================
+def fitness_phases(f_vals, alphas):
+    """phi_i = alpha * f(x_i), one row per alpha: (len(alphas), M)."""
+    return np.multiply.outer(np.asarray(alphas, dtype=float), f_vals)
+
+def rank_phases(f_vals):
+    """phi_i = 2*pi * rank_i / M (rank 0 = lowest fitness)."""
+    f_vals = np.asarray(f_vals)
+    ranks = np.argsort(np.argsort(f_vals, axis=-1), axis=-1)
+    return 2 * np.pi * ranks / f_vals.shape[-1]
+
+def step_phases(mask, phis):
+    """phi_i = phi where mask is set, else 0; one row per phi: (len(phis), M)."""
+    return np.multiply.outer(np.asarray(phis, dtype=float), np.asarray(mask, dtype=float))
+
+def apply_phase(psi, phases, out=None):
+    """Diagonal gate psi_i -> psi_i * exp(i*phi_i); phases broadcast against psi."""
+    gate = np.exp(1j * np.asarray(phases, dtype=np.asarray(psi).real.dtype))
+    return np.multiply(psi, gate, out=out)
+
+# ===================== MIXERS =====================
+def dft(psi, inverse=False):
+    """Unitary DFT (norm="ortho") of every state along the last axis."""
+    if inverse:
+        return np.fft.ifft(psi, axis=-1, norm="ortho")
+    return np.fft.fft(psi, axis=-1, norm="ortho")
+
+def apply_unitary(psi, U):
+    """Dense mixer: psi -> U @ psi for every state (U is (M, M))."""
+    return np.matmul(psi, np.asarray(U).T)
+
+# ===================== READOUT =====================
+def probabilities(psi):
+    """Born-rule distribution |psi_i|^2, renormalized per state."""
+    probs = np.abs(psi) ** 2
+    probs /= probs.sum(axis=-1, keepdims=True)
+    return probs
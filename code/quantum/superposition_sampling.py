@@ -1,86 +1,93 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from classical.landscapes import get_landscape
+
+from .measurement import basin_masks, basin_probabilities
+from .statevector import uniform_states
 
 # Domain
 X_MIN, X_MAX = -6.0, 6.0
 
 # Twin peaks fitness (NOT used yet, just for visualization later)
-def fitness_twin_peaks(x):
-    return 10*np.exp(-(x-3)**2) + 5*np.exp(-(x+3)**2)
-
-def classical_sampling(N):
-    # Uniform iid samples
-    xs = np.random.uniform(X_MIN, X_MAX, size=N)
-    left = np.sum(xs < 0)
-    right = np.sum(xs >= 0)
-    return left, right
-
-N = 10_000
-cl_left, cl_right = classical_sampling(N)
+fitness_twin_peaks = get_landscape("twin_peaks")
 
-print("Classical sampling:")
-print("Left basin :", cl_left / N)
-print("Right basin:", cl_right / N)
+def classical_sampling(N=None):
+    # Uniform iid samples on [X_MIN, X_MAX): left basin is x < 0.
+    # Exact fractions, or those of N samples (one binomial draw).
+    left = (0 - X_MIN) / (X_MAX - X_MIN)
+    if N is not None:
+        left = np.random.binomial(N, left) / N
+    return left, 1 - left
 
 def make_grid(M):
-    xs = np.linspace(X_MIN, X_MAX, M)
+    xs, _ = fitness_twin_peaks.grid(M)
     return xs
 
-M = 64
-x_grid = make_grid(M)
-
 def uniform_quantum_state(M):
     # |ψ> = (1/sqrt(M)) Σ |i>
-    psi = np.ones(M, dtype=np.complex128) / np.sqrt(M)
-    return psi
+    return uniform_states(M)
+
+def quantum_measurements(psi, x_grid, N=None):
+    # (left, right) basin probabilities: exact, or frequencies of N shots
+    _, masks = basin_masks(fitness_twin_peaks, x_grid)
+    masses, _ = basin_probabilities(psi, masks, N)
+    return masses[..., 0], masses[..., 1]
+
 
-psi = uniform_quantum_state(M)
-print("Norm:", np.sum(np.abs(psi)**2))
+def main():
+    import matplotlib.pyplot as plt
 
+    N = None  # None: exact probabilities; e.g. 10_000 for finite-shot estimates
+    cl_left, cl_right = classical_sampling(N)
 
-def quantum_measurements(psi, x_grid, N):
-    probs = np.abs(psi)**2
-    indices = np.random.choice(len(x_grid), size=N, p=probs)
-    xs = x_grid[indices]
-    left = np.sum(xs < 0)
-    right = np.sum(xs >= 0)
-    return left, right
+    print("Classical sampling:")
+    print("Left basin :", cl_left)
+    print("Right basin:", cl_right)
 
-q_left, q_right = quantum_measurements(psi, x_grid, N)
+    M = 64
+    x_grid = make_grid(M)
 
-print("Quantum sampling:")
-print("Left basin :", q_left / N)
-print("Right basin:", q_right / N)
+    psi = uniform_quantum_state(M)
+    print("Norm:", np.sum(np.abs(psi)**2))
 
+    q_left, q_right = quantum_measurements(psi, x_grid, N)
 
-print("\nDifference (Quantum - Classical):")
-print("Left basin :", (q_left - cl_left) / N)
-print("Right basin:", (q_right - cl_right) / N)
+    print("Quantum sampling:")
+    print("Left basin :", q_left)
+    print("Right basin:", q_right)
 
-Ms = [32, 64, 128, 256]
 
-results = []
+    print("\nDifference (Quantum - Classical):")
+    print("Left basin :", q_left - cl_left)
+    print("Right basin:", q_right - cl_right)
 
-for M in Ms:
-    x_grid = make_grid(M)
-    psi = uniform_quantum_state(M)
-    qL, qR = quantum_measurements(psi, x_grid, N)
-    results.append((M, qL/N, qR/N))
+    Ms = [32, 64, 128, 256]
+
+    results = []
+
+    for M in Ms:
+        x_grid = make_grid(M)
+        psi = uniform_quantum_state(M)
+        qL, qR = quantum_measurements(psi, x_grid, N)
+        results.append((M, qL, qR))
+
+    for r in results:
+        print(f"M={r[0]:3d} | Left={r[1]:.4f}, Right={r[2]:.4f}")
 
-for r in results:
-    print(f"M={r[0]:3d} | Left={r[1]:.4f}, Right={r[2]:.4f}")
 
+    labels = [f"M={r[0]}" for r in results]
+    left_vals = [r[1] for r in results]
+    right_vals = [r[2] for r in results]
 
-labels = [f"M={r[0]}" for r in results]
-left_vals = [r[1] for r in results]
-right_vals = [r[2] for r in results]
+    plt.figure()
+    plt.plot(labels, left_vals, label="Left basin")
+    plt.plot(labels, right_vals, label="Right basin")
+    plt.axhline(0.5, linestyle="--")
+    plt.ylabel("Probability")
+    plt.title("Quantum sampling vs resolution")
+    plt.legend()
+    plt.show()
 
-plt.figure()
-plt.plot(labels, left_vals, label="Left basin")
-plt.plot(labels, right_vals, label="Right basin")
-plt.axhline(0.5, linestyle="--")
-plt.ylabel("Probability")
-plt.title("Quantum sampling vs resolution")
-plt.legend()
-plt.show()
 
+if __name__ == "__main__":
+    main()
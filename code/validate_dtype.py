@@ -0,0 +1,122 @@
+import argparse
+import sys
+
+import numpy as np
+
+from classical import twin_peaks
+from classical.engine import run_batched_ga
+from quantum import phase_interference_naive as naive
+from quantum import phase_structured_superpositions as structured
+from quantum.hybrid_ga import run_hybrid_ga
+from quantum.hybridTest import fitness_twin_peaks
+
+# ============================================================
+# SINGLE-PRECISION VALIDATION
+# ------------------------------------------------------------
+# Runs the same experiments in float64 / complex128 and in
+# float32 / complex64 and checks that the conclusions agree:
+#   twin_peaks  the deceptive GA (batched engine with twin_peaks.py's
+#               frozen parameters): classify_run label of every trial
+#   hybrid_ga   basin of every trial's best point, with and without
+#               quantum re-exploration
+#   quantum     measure_state left/right of the fitness-phase alpha
+#               sweep (phase_interference_naive) over several grid
+#               sizes and of the phi sweep (phase_structured_superpositions)
+# GA trials draw the same float64 random numbers in both precisions,
+# so labels are compared trial by trial.
+#
+# From the code/ directory:
+#   python validate_dtype.py [--trials 200] [--seed 0]
+# Exit status 1 when a check fails.
+# ============================================================
+
+PRECISIONS = ((np.float64, np.complex128), (np.float32, np.complex64))
+
+
+# ===================== GA OUTCOMES =====================
+def twin_peaks_labels(trials, seed, dtype):
+    out = run_batched_ga(
+        twin_peaks.fitness, twin_peaks.DOMAIN, trials,
+        pop_size=twin_peaks.POP, gens=twin_peaks.GENS, elitism=twin_peaks.ELITISM,
+        tournament_k=twin_peaks.TOURNAMENT_K, crossover_prob=1.0,
+        mutation_pm=twin_peaks.MUT_P, mutation_sigma=twin_peaks.MUT_SIGMA,
+        seed=seed, dtype=dtype,
+    )
+    return np.array([twin_peaks.classify_run(pop) for pop in out["final_pop"]])
+
+
+def hybrid_labels(trials, seed, dtype, explore):
+    out = run_hybrid_ga(trials, explore=explore, seed=seed, dtype=dtype)
+    best_x = out["final_pop"][np.arange(trials), out["final_scores"].argmax(axis=1)]
+    return fitness_twin_peaks.classify(best_x)
+
+
+def compare_labels(name, labels64, labels32, min_agreement):
+    agree = np.mean(labels64 == labels32)
+    kinds = sorted(set(labels64) | set(labels32))
+    counts = ", ".join(f"{k} {np.sum(labels64 == k)}/{np.sum(labels32 == k)}" for k in kinds)
+    ok = agree >= min_agreement
+    print(f"{'ok  ' if ok else 'FAIL'} {name:28s} trials agreeing {agree:6.1%}  "
+          f"(float64/float32: {counts})")
+    return ok
+
+
+# ===================== QUANTUM READOUT =====================
+def alpha_sweep(M, dtype):
+    x_grid, f_vals = naive.fitness.grid(M)
+    alphas = np.linspace(0.0, 0.5, 11)
+    psi = naive.mix_state(naive.fitness_phase_state(x_grid, f_vals, alphas, dtype))
+    return naive.measure_state(psi, x_grid)
+
+
+def phi_sweep(M, dtype):
+    x_grid = structured.superposition_sampling.make_grid(M)
+    phis = np.linspace(0.0, 2 * np.pi, 9)
+    psi = structured.mix_state(structured.phase_structured_state(x_grid, phis, dtype))
+    return structured.measure_state(psi, x_grid)
+
+
+def compare_readout(name, readout64, readout32, atol):
+    (L64, R64), (L32, R32) = readout64, readout32
+    err = max(np.max(np.abs(L64 - L32)), np.max(np.abs(R64 - R32)))
+    # which side wins, wherever float64 is not (within atol) a tie
+    decided = np.abs(L64 - R64) > atol
+    same_side = np.all((L64 > R64)[decided] == (L32 > R32)[decided])
+    ok = err <= atol and same_side
+    print(f"{'ok  ' if ok else 'FAIL'} {name:28s} max |left/right diff| {err:.1e}, "
+          f"winning side {'agrees' if same_side else 'DIFFERS'}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check float32/complex64 runs against float64.")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-agreement", type=float, default=0.95,
+                        help="share of GA trials whose labels must match (default 0.95)")
+    parser.add_argument("--atol", type=float, default=1e-4,
+                        help="largest allowed basin-probability difference (default 1e-4)")
+    args = parser.parse_args(argv)
+
+    checks = []
+    runs = {
+        "twin_peaks classify_run": lambda dt: twin_peaks_labels(args.trials, args.seed, dt),
+        "hybrid_ga (classical)": lambda dt: hybrid_labels(args.trials, args.seed, dt, False),
+        "hybrid_ga (explore)": lambda dt: hybrid_labels(args.trials, args.seed, dt, True),
+    }
+    for name, run in runs.items():
+        labels = [run(real) for real, _ in PRECISIONS]
+        checks.append(compare_labels(name, *labels, args.min_agreement))
+
+    for M in (64, 256, 1024):
+        readouts = [alpha_sweep(M, cplx) for _, cplx in PRECISIONS]
+        checks.append(compare_readout(f"alpha sweep M={M}", *readouts, args.atol))
+    readouts = [phi_sweep(128, cplx) for _, cplx in PRECISIONS]
+    checks.append(compare_readout("phi sweep M=128", *readouts, args.atol))
+
+    print("all checks passed" if all(checks) else "some checks FAILED")
+    return 0 if all(checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())